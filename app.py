@@ -1,74 +1,136 @@
 # # Multiprocess-Alarm-Schedule
 
 import tkinter as tk
-from tkinter import ttk, messagebox, Canvas
+from tkinter import ttk, messagebox, filedialog, Canvas
+import bisect
+import collections
 import datetime
+import math
+import os
 import time
-import threading
-import queue as thread_queue       
-import winsound
-
-class ManagedProcess:
-    def __init__(self, pid, name, sleep_time, priority, queue):
-        self.pid = pid
-        self.name = name
-        self.sleep_time = sleep_time
-        self.priority = priority
-        self.queue = queue
-        self.status = "Waiting"
-        self.start_time = None
-        self.end_time = None
-        self.progress = 0
-        self.remaining = sleep_time
-        self.thread = None
-        self.pause_event = threading.Event()
-        self.pause_event.set()
-        self.is_running = False
-
-    def run(self):
-        self.start_time = datetime.datetime.now().strftime("%H:%M:%S")
-        self.queue.put(("gantt_start", self.pid, time.time()))
-        self.is_running = True
-        
-        while self.remaining > 0 and self.is_running:
-            self.pause_event.wait()  # Wait if paused
-            if not self.is_running:  # Check if stopped
-                break
-            time.sleep(1)
-            if self.is_running:  # Double check before decrementing
-                self.remaining -= 1
-                self.progress = int(100 * (self.sleep_time - self.remaining) / self.sleep_time)
-                self.queue.put(("update", self.pid, self.progress))
-        
-        if self.remaining <= 0:
-            self.end_time = datetime.datetime.now().strftime("%H:%M:%S")
-            self.status = "Completed"
-            self.is_running = False
-            self.queue.put(("completed", self.pid))
-            self.queue.put(("gantt_end", self.pid, time.time()))
-
-    def start(self):
-        if not self.thread or not self.thread.is_alive():
-            self.thread = threading.Thread(target=self.run)
-            self.thread.daemon = True
-            self.thread.start()
-
-    def pause(self):
-        self.pause_event.clear()
-        if self.status != "Completed":
-            self.status = "Paused"
-
-    def resume(self):
-        self.pause_event.set()
-        if self.status != "Completed":
-            self.status = "Running"
-
-    def stop(self):
-        self.is_running = False
-        self.pause_event.set()  # Unblock if waiting
+
+from bulk_import import iter_import
+from notifications import Notifier, build_notifier
+from profiling import Capture, FrameProfiler
+from timers import parse_when
+from policies import POLICIES, make_policy
+from scheduler_core import (AdaptiveConcurrency, AdaptivePoll, SchedulerCore, build_core, load_work, parse_args,
+                            run_headless)
+
+try:
+    import winsound
+except ImportError:  # Not available outside Windows
+    winsound = None
+
+class ToastSink:
+    """Non-modal notifications stacked in the bottom-right corner of the window"""
+
+    def __init__(self, root, duration_ms=4000, max_visible=4):
+        self.root = root
+        self.duration_ms = duration_ms
+        self.max_visible = max_visible
+        self.toasts = []
+
+    def emit(self, message):
+        if winsound is not None:
+            winsound.MessageBeep()
+        else:
+            self.root.bell()
+
+        toast = tk.Label(self.root, text=f"🔔 {message}", bg='#1e293b', fg='white',
+                         font=('Segoe UI', 10, 'bold'), padx=14, pady=8)
+        toast.bind('<Button-1>', lambda e: self.dismiss(toast))
+        self.toasts.append(toast)
+        if len(self.toasts) > self.max_visible:
+            self.dismiss(self.toasts[0])
+        self.root.after(self.duration_ms, self.dismiss, toast)
+        self.layout()
+
+    def dismiss(self, toast):
+        if toast in self.toasts:
+            self.toasts.remove(toast)
+            toast.destroy()
+            self.layout()
+
+    def layout(self):
+        for i, toast in enumerate(reversed(self.toasts)):
+            toast.place(relx=1.0, rely=1.0, x=-20, y=-20 - i * 44, anchor='se')
+            toast.lift()
+
+
+class TkWaker:
+    """Wakes the Tk main loop from worker threads.
+
+    Where Tk supports file handlers (POSIX), ``wake()`` writes a byte to a
+    pipe watched by the event loop. Elsewhere (Windows) it only sets a flag
+    that an ``after()`` loop checks every ``fallback_ms``: calling Tk from
+    another thread blocks until the Tk thread serves the call, which
+    deadlocks if that thread is waiting on a lock the caller holds. Either
+    way ``callback`` runs on the Tk thread. Wake-ups that arrive before the
+    callback ran are coalesced into one.
+    """
+
+    fallback_ms = 10
+
+    def __init__(self, root, callback):
+        self.root = root
+        self.callback = callback
+        self._pending = False
+        self._after = None
+        self._read_fd = self._write_fd = None
+        try:
+            self._read_fd, self._write_fd = os.pipe()
+            os.set_blocking(self._write_fd, False)
+            root.tk.createfilehandler(self._read_fd, tk.READABLE, self._on_readable)
+        except (AttributeError, OSError, tk.TclError):
+            self._close_pipe()
+            self._check_flag()
+
+    def wake(self):
+        if self._pending:
+            return
+        self._pending = True
+        if self._write_fd is not None:
+            try:
+                os.write(self._write_fd, b"x")
+            except BlockingIOError:
+                pass  # The pipe is full, so a wake-up is already on its way
+
+    def _check_flag(self):
+        if self._pending:
+            self._run()
+        self._after = self.root.after(self.fallback_ms, self._check_flag)
+
+    def _on_readable(self, fd, mask):
+        os.read(fd, 4096)
+        self._run()
+
+    def _run(self):
+        self._pending = False
+        self.callback()
+
+    def _close_pipe(self):
+        for fd in (self._read_fd, self._write_fd):
+            if fd is not None:
+                os.close(fd)
+        self._read_fd = self._write_fd = None
+
+    def close(self):
+        if self._read_fd is not None:
+            self.root.tk.deletefilehandler(self._read_fd)
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+        self._close_pipe()
+
 
 class ModernSchedulerApp:
-    def __init__(self, root):
+    max_log_lines = 2000            # on-screen log history, older lines scroll out
+
+    # Log lines are colored by their leading emoji
+    log_tags = {"✅": "success", "🎉": "success", "🔄": "info", "🚀": "info", "▶": "info"}
+
+    def __init__(self, root, core=None, notifier=None, poll=None):
         self.root = root
         self.root.title("🚀 Modern Process Scheduler - Thor UI")
         self.root.geometry("1400x900")
@@ -91,19 +153,35 @@ class ModernSchedulerApp:
             'completed': '#8b5cf6'     # Purple
         }
         
-        self.process_list = []
-        self.running_processes = []
-        self.paused_processes = []
-        self.pid_counter = 1
-        self.max_running = 2
-        self.queue = thread_queue.Queue()
-        self.preemptive_enabled = tk.BooleanVar(value=False)
+        self.core = core or SchedulerCore()
+        self.core.subscribe(self.on_core_event)
+        self.notifier = notifier or Notifier()
+        self.notifier.add_sink(ToastSink(root))
+        self.preemptive_enabled = tk.BooleanVar(value=self.core.preemptive_enabled)
+        self.adaptive_enabled = tk.BooleanVar(value=False)
+        self.adaptive = AdaptiveConcurrency(self.core)
         self.selected_pid = None
-        self.gantt_data = {}
         self.last_update_time = 0
+        self.tree_items = {}        # pid -> Treeview item id
+        self.tree_values = {}       # pid -> values last written to the row
+        self.tree_keys = {}         # pid -> sort key of the row
+        self.tree_order = []        # sort keys in row order
+        self.tree_sort_mode = None
+        self.log_pending = collections.deque(maxlen=self.max_log_lines)
+        self.log_lines = 0          # lines currently in log_box
+        self.profiler = FrameProfiler()
+        self.capture = None         # running on-demand profiling session
+        self.overlay = None
+        self.poll = poll or AdaptivePoll(self.core, fastest=0.1, slowest=1.0)
+        self.waker = TkWaker(root, self.on_wake)
+        self.core.queue.wakeup = self.waker.wake
 
         self.setup_styles()
         self.build_modern_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind('<F12>', lambda e: self.toggle_overlay())
+        self.root.bind('<Shift-F12>', lambda e: self.toggle_capture("cprofile"))
+        self.root.bind('<Control-F12>', lambda e: self.toggle_capture("sampling"))
         self.update_gui()
 
     def setup_styles(self):
@@ -254,6 +332,48 @@ class ModernSchedulerApp:
                                         command=self.on_preemptive_change)
         preemptive_check.grid(row=0, column=7, padx=10, pady=5)
 
+        tk.Label(form_frame, text="Max Running:", bg='white',
+                font=('Segoe UI', 10, 'bold')).grid(row=1, column=0, padx=5, pady=5, sticky='w')
+        self.max_running_var = tk.StringVar(value=str(self.core.max_running))
+        max_running_spin = tk.Spinbox(form_frame, from_=1, to=1024, width=6, font=('Segoe UI', 10),
+                                      textvariable=self.max_running_var,
+                                      command=self.on_max_running_change)
+        max_running_spin.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+        max_running_spin.bind('<Return>', lambda e: self.on_max_running_change())
+
+        adaptive_check = tk.Checkbutton(form_frame, text="📈 Adaptive Concurrency",
+                                      variable=self.adaptive_enabled,
+                                      bg='white', font=('Segoe UI', 10))
+        adaptive_check.grid(row=1, column=2, columnspan=3, padx=5, pady=5, sticky='w')
+
+        self.import_btn = self.create_modern_button(form_frame, "📥 Import", self.import_file,
+                                                    self.colors['info'], '#0891b2')
+        self.import_btn.grid(row=1, column=6, padx=10, pady=5)
+
+        tk.Label(form_frame, text="Policy:", bg='white',
+                font=('Segoe UI', 10, 'bold')).grid(row=2, column=0, padx=5, pady=5, sticky='w')
+        self.policy_box = ttk.Combobox(form_frame, values=sorted(POLICIES), width=10, state='readonly',
+                                       font=('Segoe UI', 10))
+        self.policy_box.grid(row=2, column=1, padx=5, pady=5, sticky='w')
+        self.policy_box.set(self.core.policy.name)
+        self.policy_box.bind('<<ComboboxSelected>>', lambda e: self.on_policy_change())
+
+        tk.Label(form_frame, text="Quantum (s):", bg='white',
+                font=('Segoe UI', 10, 'bold')).grid(row=2, column=2, padx=5, pady=5, sticky='w')
+        self.quantum_entry = tk.Entry(form_frame, font=('Segoe UI', 10), width=8, relief='flat', bd=5)
+        self.quantum_entry.grid(row=2, column=3, padx=5, pady=5)
+        self.quantum_entry.bind('<Return>', lambda e: self.on_policy_change())
+
+        tk.Label(form_frame, text="Fire At:", bg='white',
+                font=('Segoe UI', 10, 'bold')).grid(row=2, column=4, padx=5, pady=5, sticky='w')
+        self.at_entry = tk.Entry(form_frame, font=('Segoe UI', 10), width=16, relief='flat', bd=5)
+        self.at_entry.grid(row=2, column=5, columnspan=2, padx=5, pady=5, sticky='w')
+
+        tk.Label(form_frame, text="Repeat:", bg='white',
+                font=('Segoe UI', 10, 'bold')).grid(row=3, column=4, padx=5, pady=5, sticky='w')
+        self.repeat_entry = tk.Entry(form_frame, font=('Segoe UI', 10), width=16, relief='flat', bd=5)
+        self.repeat_entry.grid(row=3, column=5, columnspan=2, padx=5, pady=5, sticky='w')
+
         # Priority Change Card
         priority_card, priority_content = self.create_card_frame(main_container, "⚙️ Change Process Priority", 
                                                                title_bg=self.colors['warning'])
@@ -311,11 +431,11 @@ class ModernSchedulerApp:
         
         # Create treeview with modern styling
         self.process_tree = ttk.Treeview(grid_container, 
-                                       columns=("PID", "Name", "Priority", "Status", "Progress", "Start", "End"),
+                                       columns=("PID", "Name", "Priority", "Status", "Progress", "Start", "End", "Repeats"),
                                        show="headings", height=12)
         
         # Configure column headings
-        headings = ["PID", "Name", "Priority", "Status", "Progress", "Start Time", "End Time"]
+        headings = ["PID", "Name", "Priority", "Status", "Progress", "Start Time", "End Time", "Repeats"]
         for i, heading in enumerate(headings):
             col = self.process_tree["columns"][i]
             self.process_tree.heading(col, text=heading)
@@ -348,13 +468,32 @@ class ModernSchedulerApp:
                               font=('Consolas', 10), relief='flat', bd=10,
                               bg='#1e293b', fg='#e2e8f0')
         self.log_box.pack(fill='both', expand=True, padx=10, pady=10)
+        self.log_box.tag_config("success", foreground="#10b981")
+        self.log_box.tag_config("info", foreground="#06b6d4")
 
         # Gantt Chart Tab
         gantt_frame = tk.Frame(self.notebook, bg='white')
         self.notebook.add(gantt_frame, text="📊 Gantt Chart")
         
-        self.gantt_canvas = Canvas(gantt_frame, width=1200, height=400, bg='white', relief='flat')
-        self.gantt_canvas.pack(fill='both', expand=True, padx=10, pady=10)
+        gantt_container = tk.Frame(gantt_frame, bg='white')
+        gantt_container.pack(fill='both', expand=True, padx=10, pady=10)
+        gantt_container.rowconfigure(0, weight=1)
+        gantt_container.columnconfigure(0, weight=1)
+
+        self.gantt_canvas = Canvas(gantt_container, width=1200, height=400, bg='white', relief='flat')
+        gantt_vscroll = ttk.Scrollbar(gantt_container, orient="vertical", command=self.on_gantt_yview)
+        gantt_hscroll = ttk.Scrollbar(gantt_container, orient="horizontal", command=self.gantt_canvas.xview)
+        self.gantt_canvas.configure(yscrollcommand=gantt_vscroll.set, xscrollcommand=gantt_hscroll.set)
+
+        self.gantt_canvas.grid(row=0, column=0, sticky='nsew')
+        gantt_vscroll.grid(row=0, column=1, sticky='ns')
+        gantt_hscroll.grid(row=1, column=0, sticky='ew')
+
+        self.gantt_canvas.bind('<Configure>', lambda e: self.draw_modern_gantt_chart())
+        self.gantt_canvas.bind('<MouseWheel>', lambda e: self.on_gantt_yview("scroll", -e.delta // 120, "units"))
+        self.gantt_canvas.bind('<Button-4>', lambda e: self.on_gantt_yview("scroll", -1, "units"))
+        self.gantt_canvas.bind('<Button-5>', lambda e: self.on_gantt_yview("scroll", 1, "units"))
+        self.init_gantt_chart()
 
         # Statistics Cards
         stats_frame = tk.Frame(main_container, bg=self.colors['light'])
@@ -395,6 +534,13 @@ class ModernSchedulerApp:
             
             self.stat_labels[key] = count_label
 
+        self.queue_label = tk.Label(parent, text="", bg=self.colors['light'], fg=self.colors['dark'],
+                                    font=('Segoe UI', 9))
+        self.queue_label.pack(anchor='e', pady=(5, 0))
+        self.policy_label = tk.Label(parent, text="", bg=self.colors['light'], fg=self.colors['dark'],
+                                     font=('Segoe UI', 9))
+        self.policy_label.pack(anchor='e')
+
     def on_tree_select(self, event):
         """Handle tree selection"""
         selection = self.process_tree.selection()
@@ -408,58 +554,160 @@ class ModernSchedulerApp:
 
     def on_preemptive_change(self):
         """Handle preemptive mode change"""
+        self.core.preemptive_enabled = self.preemptive_enabled.get()
         self.schedule()
 
+    def on_policy_change(self):
+        """Switch to the selected scheduling policy, keeping the preemptive setting for priority scheduling"""
+        text = self.quantum_entry.get().strip()
+        try:
+            quantum = float(text) if text else None
+        except ValueError:
+            messagebox.showerror("❌ Invalid Input", "Quantum must be a number of seconds.")
+            return
+        if quantum is not None and quantum <= 0:
+            messagebox.showerror("❌ Invalid Input", "Quantum must be positive.")
+            return
+        self.core.set_policy(make_policy(self.policy_box.get(), quantum, self.preemptive_enabled.get()))
+        self.preemptive_enabled.set(self.core.preemptive_enabled)
+        self.schedule()
+
+    def on_max_running_change(self):
+        """Apply a new concurrency limit from the spinbox"""
+        try:
+            self.core.set_max_running(int(self.max_running_var.get()))
+        except ValueError:
+            messagebox.showerror("❌ Invalid Input", "Max running must be a number.")
+        self.max_running_var.set(str(self.core.max_running))
+
+    def on_close(self):
+        """Flush the journal, log file and notification sinks before the window goes away"""
+        if self.capture is not None:
+            self.capture.stop()
+        self.core.queue.wakeup = None
+        self.waker.close()
+        self.notifier.close()
+        self.core.close()
+        self.root.destroy()
+
+    def on_core_event(self, kind, message):
+        """Route scheduler core log/notify events to the UI"""
+        if kind == "log":
+            self.log(message)
+        elif kind == "notify":
+            self.notify(message)
+
     def update_stats(self):
         """Update statistics cards"""
         stats = {
-            'running': len([p for p in self.process_list if p.status == "Running"]),
-            'paused': len([p for p in self.process_list if p.status == "Paused"]),
-            'waiting': len([p for p in self.process_list if p.status == "Waiting"]),
-            'completed': len([p for p in self.process_list if p.status == "Completed"])
+            'running': self.core.count("Running"),
+            'paused': self.core.count("Paused"),
+            'waiting': self.core.count("Waiting"),
+            'completed': self.core.total("Completed")
         }
         
         for key, count in stats.items():
             if key in self.stat_labels:
                 self.stat_labels[key].configure(text=str(count))
 
+        self.queue_label.configure(
+            text=f"📨 Queue depth: {self.core.queue_depth}   ⏱️ Event lag: {self.core.event_lag * 1000:.0f} ms   "
+                 f"⚡ Refill: {self.core.refill_latency.mean() * 1000:.1f} ms{self.scheduled_text()}")
+        report = self.core.policy_report()
+        self.policy_label.configure(
+            text=f"📐 {report['policy']}   🏁 {report['throughput']:.2f}/s   "
+                 f"🔁 Avg turnaround: {report['avg_turnaround']:.1f}s   ⌛ Avg waiting: {report['avg_waiting']:.1f}s")
+
+    def scheduled_text(self):
+        timers = self.core.timers
+        if not timers:
+            return ""
+        next_due = timers.next_due(self.core.engine.wall())
+        when = datetime.datetime.fromtimestamp(next_due).strftime("%H:%M:%S") if next_due else "-"
+        recurring = f"   🔁 Recurring: {len(timers.recurrences)}" if timers.recurrences else ""
+        return f"   ⏰ Scheduled: {len(timers)} (next due {when}){recurring}"
+
     def get_status_color(self, status):
         """Get color for process status"""
         status_colors = {
             "Running": "#10b981",
             "Paused": "#f59e0b", 
             "Waiting": "#06b6d4",
-            "Completed": "#8b5cf6"
+            "Completed": "#8b5cf6",
+            "Failed": "#ef4444"
         }
         return status_colors.get(status, "#6b7280")
 
     def add_process(self):
         name = self.name_entry.get().strip()
         try:
-            time_ = int(self.sleep_entry.get())
+            time_ = float(self.sleep_entry.get())
             priority = int(self.priority_box.get())
         except ValueError:
             messagebox.showerror("❌ Invalid Input", "Time and priority must be numbers.")
             return
+        if not math.isfinite(time_) or time_ < 0:
+            messagebox.showerror("❌ Invalid Input", "Time must be a finite number of seconds, 0 or more.")
+            return
         
         if not name:
             messagebox.showerror("❌ Invalid Input", "Process name cannot be empty.")
             return
-            
-        proc = ManagedProcess(self.pid_counter, name, time_, priority, self.queue)
-        self.process_list.append(proc)
-        self.log(f"✅ Process {proc.pid} ({proc.name}) added with priority {priority}")
-        self.notify(f"🎉 Process {proc.pid} added successfully!")
-        self.pid_counter += 1
+
+        at = self.at_entry.get().strip()
+        fire_at = None
+        if at:
+            try:
+                fire_at = parse_when(at)
+            except ValueError:
+                messagebox.showerror("❌ Invalid Input",
+                                     "Fire At must be an ISO date and time, HH:MM[:SS] or +SECONDS.")
+                return
+        repeat = self.repeat_entry.get().strip()
+        if repeat:
+            try:
+                self.core.add_recurring(name, repeat, time_, priority, start=fire_at)
+            except ValueError as e:
+                messagebox.showerror("❌ Invalid Input",
+                                     f"Repeat must be a cron expression or '@every 5m': {e}")
+                return
+        elif fire_at is not None:
+            self.core.add_alarm_at(name, fire_at, time_, priority)
+        else:
+            self.core.add_process(name, time_, priority)
         
         # Clear form
         self.name_entry.delete(0, tk.END)
         self.sleep_entry.delete(0, tk.END)
+        self.at_entry.delete(0, tk.END)
+        self.repeat_entry.delete(0, tk.END)
         self.priority_box.set(5)
         
         # Schedule immediately
         self.root.after(100, self.schedule)
 
+    def import_file(self):
+        path = filedialog.askopenfilename(title="Import Alarms",
+                                          filetypes=[("Alarm files", "*.csv *.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+        self.import_btn.config(state='disabled')
+        self.step_import(iter_import(self.core, path))
+
+    def step_import(self, chunks):
+        """Load one chunk per Tk callback so the window stays responsive"""
+        try:
+            next(chunks)
+        except StopIteration:
+            self.import_btn.config(state='normal')
+            self.schedule()
+            return
+        except (OSError, UnicodeDecodeError) as e:
+            self.import_btn.config(state='normal')
+            messagebox.showerror("❌ Import Failed", str(e))
+            return
+        self.root.after(1, self.step_import, chunks)
+
     def change_priority(self):
         try:
             pid = int(self.pid_change_entry.get())
@@ -468,194 +716,211 @@ class ModernSchedulerApp:
             messagebox.showerror("❌ Invalid Input", "Priority and PID must be numbers.")
             return
             
-        for p in self.process_list:
-            if p.pid == pid:
-                old_priority = p.priority
-                p.priority = new_priority
-                self.log(f"🔄 Process {pid} priority changed from {old_priority} to {new_priority}")
-                self.notify(f"✅ Priority of Process {pid} updated!")
-                
-                # Clear form
-                self.pid_change_entry.delete(0, tk.END)
-                self.new_priority_entry.delete(0, tk.END)
-                
-                # Reschedule
-                self.root.after(100, self.schedule)
-                return
+        if self.core.change_priority(pid, new_priority):
+            # Clear form
+            self.pid_change_entry.delete(0, tk.END)
+            self.new_priority_entry.delete(0, tk.END)
+            
+            # Reschedule
+            self.root.after(100, self.schedule)
+            return
         
         messagebox.showerror("❌ Process Not Found", f"Process with PID {pid} not found.")
 
     def schedule(self):
-        """Improved scheduling logic"""
-        # Get current process states
-        running = [p for p in self.process_list if p.status == "Running"]
-        paused = [p for p in self.process_list if p.status == "Paused"]
-        waiting = [p for p in self.process_list if p.status == "Waiting"]
-        completed = [p for p in self.process_list if p.status == "Completed"]
-        
-        # Available slots
-        available_slots = self.max_running - len(running)
-        
-        if self.preemptive_enabled.get():
-            # Preemptive scheduling - priority based
-            all_active = running + paused + waiting
-            all_active = [p for p in all_active if p.status != "Completed"]
-            all_active.sort(key=lambda x: x.priority)
-            
-            # Stop all currently running processes
-            for p in running:
-                p.pause()
-            
-            # Start/resume top priority processes
-            for i, process in enumerate(all_active[:self.max_running]):
-                if process.status in ["Paused", "Waiting"]:
-                    if process.status == "Waiting":
-                        process.start()
-                    process.resume()
-                    process.status = "Running"
-            
-            # Pause remaining processes
-            for process in all_active[self.max_running:]:
-                if process.status == "Running":
-                    process.pause()
-                process.status = "Paused"
-                
-        else:
-            # Non-preemptive scheduling - FIFO with priority
-            if available_slots > 0 and waiting:
-                # Sort waiting processes by priority
-                waiting.sort(key=lambda x: x.priority)
-                
-                # Start processes up to available slots
-                for process in waiting[:available_slots]:
-                    process.start()
-                    process.status = "Running"
-                    self.log(f"🚀 Process {process.pid} ({process.name}) started")
-            
-            # If there are paused processes and available slots, resume them
-            if available_slots > len([p for p in waiting if p.status == "Running"]) and paused:
-                remaining_slots = available_slots - len([p for p in waiting if p.status == "Running"])
-                paused.sort(key=lambda x: x.priority)
-                
-                for process in paused[:remaining_slots]:
-                    process.resume()
-                    process.status = "Running"
-                    self.log(f"▶️ Process {process.pid} ({process.name}) resumed")
-
-        # Update process lists
-        self.running_processes = [p.pid for p in self.process_list if p.status == "Running"]
-        self.paused_processes = [p.pid for p in self.process_list if p.status == "Paused"]
+        self.core.schedule()
+
+    def on_wake(self):
+        """A completion was queued: refill its slot now rather than at the next poll"""
+        if self.core.process_events(budget=0.05):
+            self.schedule()
 
     def update_gui(self):
         """Improved GUI update with better state management"""
         current_time = time.time()
+        prof = self.profiler
+        timing = prof.enabled  # Phase timing costs one test per phase when off
+        if timing:
+            prof.begin()
         
-        # Process queue messages
-        messages_processed = 0
-        try:
-            while messages_processed < 10:  # Limit messages per update to prevent flooding
-                msg = self.queue.get_nowait()
-                messages_processed += 1
-                
-                if msg[0] == "update":
-                    pid, progress = msg[1], msg[2]
-                    for p in self.process_list:
-                        if p.pid == pid:
-                            p.progress = progress
-                            break
-                            
-                elif msg[0] == "completed":
-                    pid = msg[1]
-                    for p in self.process_list:
-                        if p.pid == pid and p.status != "Completed":
-                            p.status = "Completed"
-                            p.is_running = False
-                            self.log(f"🎉 Process {pid} ({p.name}) completed successfully!")
-                            self.notify(f"✅ Process {pid} finished execution!")
-                            # Schedule after a short delay to allow UI to update
-                            self.root.after(200, self.schedule)
-                            break
-                            
-                elif msg[0] == "gantt_start":
-                    if msg[1] not in self.gantt_data:
-                        self.gantt_data[msg[1]] = [msg[2], None]
-                        
-                elif msg[0] == "gantt_end":
-                    if msg[1] in self.gantt_data:
-                        self.gantt_data[msg[1]][1] = msg[2]
-                        
-        except thread_queue.Empty:
-            pass
+        # Drain queue messages within a per-frame time budget
+        handled = self.core.events_handled.value
+        if self.core.process_events(budget=0.05):
+            self.schedule()
+        elif self.core.policy.time_sliced:
+            self.schedule()  # Rotate processes whose time slice ran out
+        if timing:
+            prof.mark("drain")
+
+        if self.adaptive_enabled.get() and self.adaptive.update():
+            self.max_running_var.set(str(self.core.max_running))
+
+        # Deliver digests of notifications held back by the rate limit
+        self.notifier.flush()
+        self.flush_log()
+        if timing:
+            prof.mark("log")
 
         # Update UI only if enough time has passed (reduce flickering)
         if current_time - self.last_update_time >= 0.5:  # Update every 500ms
-            self.update_process_tree()
+            changed = self.core.take_changed()
+            self.update_process_tree(changed)
+            if timing:
+                prof.mark("tree")
             self.update_process_info()
-            self.draw_modern_gantt_chart()
+            if timing:
+                prof.mark("info")
+            self.draw_modern_gantt_chart(changed)
+            if timing:
+                prof.mark("gantt")
             self.update_stats()
+            if timing:
+                prof.mark("stats")
             self.last_update_time = current_time
 
-        # Schedule next update
-        self.root.after(500, self.update_gui)
-
-    def update_process_tree(self):
-        """Update process tree with reduced flickering"""
-        # Store current selection
-        current_selection = self.process_tree.selection()
-        selected_pid = None
-        if current_selection:
-            try:
-                selected_pid = int(self.process_tree.item(current_selection[0], 'values')[0])
-            except (ValueError, IndexError):
-                pass
-
-        # Clear and repopulate tree
-        self.process_tree.delete(*self.process_tree.get_children())
-
-        # Get sorted processes
-        sorted_list = self.get_sorted_processes()
-
-        # Insert processes
-        for p in sorted_list:
-            status_emoji = {"Running": "🟢", "Paused": "🟡", "Waiting": "🔵", "Completed": "🟣"}
-            status_text = f"{status_emoji.get(p.status, '⚪')} {p.status}"
-            
-            values = (
-                p.pid,
-                p.name,
-                f"⭐ {p.priority}",
-                status_text,
-                f"{p.progress}%",
-                p.start_time or "Not started",
-                p.end_time or "Not completed"
-            )
-            
-            item = self.process_tree.insert("", "end", values=values)
-            
-            # Restore selection if it was the same process
-            if selected_pid and p.pid == selected_pid:
-                self.process_tree.selection_set(item)
-
-    def get_sorted_processes(self):
-        """Get processes sorted by current criteria"""
-        sorted_list = self.process_list.copy()
-        
-        if self.sort_var.get() == "priority":
-            sorted_list.sort(key=lambda x: x.priority)
-        elif self.sort_var.get() == "status":
-            order = {"Running": 0, "Paused": 1, "Waiting": 2, "Completed": 3}
-            sorted_list.sort(key=lambda x: order.get(x.status, 99))
-        elif self.sort_var.get() == "start_time":
-            sorted_list.sort(key=lambda x: x.start_time or "")
-            
-        return sorted_list
+        if timing:
+            prof.end()
+            self.update_overlay()
+
+        # Poll faster while processes report progress, back off when idle
+        active = self.core.events_handled.value != handled
+        self.root.after(int(self.poll.next(active) * 1000), self.update_gui)
+
+    def toggle_overlay(self):
+        """F12: show or hide the frame-time overlay (phase timing runs only while shown)"""
+        if self.overlay is None:
+            self.profiler.reset()
+            self.profiler.enabled = True
+            self.overlay = tk.Label(self.root, text="⏱️ measuring...", justify='left', anchor='nw',
+                                    bg='#0f172a', fg='#a5f3fc', font=('Consolas', 9), padx=8, pady=6)
+            self.overlay.place(relx=1.0, x=-20, y=20, anchor='ne')
+        else:
+            self.profiler.enabled = False
+            self.overlay.destroy()
+            self.overlay = None
+
+    def update_overlay(self):
+        passes = self.core.pass_latency
+        text = (self.profiler.format() +
+                f"\nschedule   {self.core.last_pass_seconds * 1e3:>7.2f} {passes.mean() * 1e3:>7.2f}"
+                f"  ({passes.count} passes)")
+        if self.capture is not None:
+            text += f"\n● {self.capture.kind} capture {time.monotonic() - self.capture.started:.0f}s"
+        self.overlay.configure(text=text)
+
+    def toggle_capture(self, kind):
+        """Shift-F12 (cProfile) / Ctrl-F12 (sampling): start, or stop and save, a capture"""
+        if self.capture is None:
+            stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+            suffix = "prof" if kind == "cprofile" else "folded"
+            self.capture = Capture(f"profile-{stamp}.{suffix}", kind)
+            self.log(f"⏺️ Started {kind} capture")
+        else:
+            path = self.capture.stop()
+            self.capture = None
+            self.log(f"⏹️ Profile written to {path}")
+
+    def update_process_tree(self, changed):
+        """Apply changed processes to the tree without rebuilding it.
+
+        Rows are kept in a pid -> item map and mirrored by a sorted list of
+        sort keys, so only changed cells are rewritten and a row is moved only
+        when its sort key changes. Selection survives because rows are never
+        recreated.
+        """
+        mode = self.sort_var.get()
+        if mode != self.tree_sort_mode:
+            self.tree_sort_mode = mode
+            self.resort_process_tree()
+
+        for pid in changed:
+            p = self.core.find_process(pid)
+            item = self.tree_items.get(pid)
+
+            if p is None:
+                if item is not None:
+                    self.process_tree.delete(item)
+                    self.tree_order.remove(self.tree_keys.pop(pid))
+                    del self.tree_items[pid], self.tree_values[pid]
+                continue
+
+            values = self.tree_row_values(p)
+            key = self.sort_key(p)
+
+            if item is None:
+                index = bisect.bisect(self.tree_order, key)
+                self.tree_order.insert(index, key)
+                self.tree_items[pid] = self.process_tree.insert("", index, values=values)
+                self.tree_keys[pid] = key
+                self.tree_values[pid] = values
+                continue
+
+            if values != self.tree_values[pid]:
+                self.process_tree.item(item, values=values)
+                self.tree_values[pid] = values
+
+            if key != self.tree_keys[pid]:
+                self.tree_order.pop(bisect.bisect_left(self.tree_order, self.tree_keys[pid]))
+                index = bisect.bisect(self.tree_order, key)
+                self.tree_order.insert(index, key)
+                self.tree_keys[pid] = key
+                self.process_tree.move(item, "", index)
+
+    def resort_process_tree(self):
+        """Reorder every row after the sort criteria changed"""
+        for pid in [pid for pid in self.tree_items if self.core.find_process(pid) is None]:
+            self.process_tree.delete(self.tree_items.pop(pid))    # Removed since the last update
+            del self.tree_values[pid]
+        self.tree_keys = {pid: self.sort_key(self.core.find_process(pid)) for pid in self.tree_items}
+        self.tree_order = sorted(self.tree_keys.values())
+        for index, key in enumerate(self.tree_order):
+            self.process_tree.move(self.tree_items[key[-1]], "", index)
+
+    def tree_row_values(self, p):
+        status_emoji = {"Running": "🟢", "Paused": "🟡", "Waiting": "🔵", "Completed": "🟣", "Failed": "🔴"}
+        status_text = f"{status_emoji.get(p.status, '⚪')} {p.status}"
+
+        return (
+            p.pid,
+            p.name,
+            f"⭐ {p.priority}",
+            status_text,
+            f"{p.progress}%",
+            p.start_time or "Not started",
+            p.end_time or "Not completed",
+            self.repeats_text(p)
+        )
+
+    @staticmethod
+    def repeats_text(p):
+        if p.recurrence is not None:
+            return f"🔁 {p.recurrence.expression} #{p.occurrence}"
+        if p.fire_at is not None:
+            return f"⏰ {datetime.datetime.fromtimestamp(p.fire_at).strftime('%H:%M:%S')}"
+        return "-"
+
+    def sort_key(self, p):
+        """Sort key for the current criteria; the pid keeps ties in insertion order"""
+        mode = self.sort_var.get()
+        if mode == "priority":
+            return (p.priority, p.pid)
+        elif mode == "status":
+            order = {"Running": 0, "Paused": 1, "Waiting": 2, "Completed": 3, "Failed": 4}
+            return (order.get(p.status, 99), p.pid)
+        elif mode == "start_time":
+            return (p.start_time or "", p.pid)
+        return (p.pid,)
 
     def update_process_info(self):
         """Update process information display"""
-        if self.selected_pid is not None:
-            for p in self.process_list:
-                if p.pid == self.selected_pid:
-                    info_text = f"""
+        if self.selected_pid is None:
+            return
+        p = self.core.find_process(self.selected_pid)
+        if p is None:
+            return
+
+        drift_text = f"{p.drift * 1000:.1f} ms" if p.drift is not None else "Not completed"
+        info_text = f"""
 🔍 PROCESS INFORMATION
 {'='*50}
 
@@ -663,89 +928,185 @@ class ModernSchedulerApp:
    • Process ID: {p.pid}
    • Name: {p.name}
    • Priority: ⭐ {p.priority}
-   • Status: {p.status}
+   • Status: {p.status}{f" ({p.failure})" if p.failure else ""}
 
 📊 Execution Details:
    • Progress: {p.progress}%
    • Total Time: {p.sleep_time} seconds
-   • Remaining: {p.remaining} seconds
+   • Remaining: {p.time_left():.3f} seconds
+   • Context Switches: {p.context_switches}
+   • Repeats: {self.repeats_text(p)}
 
 ⏰ Timing Information:
    • Start Time: {p.start_time or 'Not started'}
    • End Time: {p.end_time or 'Not completed'}
+   • Timer Drift: {drift_text}
 
 {'='*50}
-                    """
-                    self.info_text.delete("1.0", tk.END)
-                    self.info_text.insert(tk.END, info_text)
-                    break
-
-    def draw_modern_gantt_chart(self):
-        """Draw a modern, colorful Gantt chart"""
-        self.gantt_canvas.delete("all")
-        
-        if not self.process_list:
-            # Show empty state
-            self.gantt_canvas.create_text(600, 200, text="📊 No processes to display", 
-                                        font=('Segoe UI', 16), fill='#6b7280')
-            self.gantt_canvas.create_text(600, 230, text="Add processes to see the Gantt chart", 
-                                        font=('Segoe UI', 12), fill='#9ca3af')
-            return
-        
-        y_start = 50
-        bar_height = 30
-        bar_spacing = 40
-        x_start = 100
-        scale = 20  # pixels per second
-        
-        # Draw title
-        self.gantt_canvas.create_text(600, 20, text="📊 Process Execution Timeline", 
-                                    font=('Segoe UI', 16, 'bold'), fill=self.colors['primary'])
-        
-        # Draw processes
-        for i, process in enumerate(self.process_list):
-            y = y_start + i * bar_spacing
-            
+        """
+        self.info_text.delete("1.0", tk.END)
+        self.info_text.insert(tk.END, info_text)
+
+    # Gantt chart layout
+    gantt_y_start = 50
+    gantt_bar_height = 30
+    gantt_bar_spacing = 40
+    gantt_x_start = 100
+    gantt_scale = 20  # pixels per second
+
+    def init_gantt_chart(self):
+        """Create the static Gantt items; rows are added by draw_modern_gantt_chart"""
+        self.gantt_pids = []        # pid of each row, top to bottom
+        self.gantt_row_of = {}      # pid -> row index
+        self.gantt_items = {}       # pid -> canvas item ids, only for rows in view
+        self.gantt_segments = {}    # pid -> item ids of its run segments, same rows
+        self.gantt_max_width = 0
+
+        self.gantt_canvas.create_text(600, 20, text="📊 Process Execution Timeline",
+                                      font=('Segoe UI', 16, 'bold'), fill=self.colors['primary'])
+        self.gantt_canvas.create_text(600, 200, text="📊 No processes to display", tags="empty",
+                                      font=('Segoe UI', 16), fill='#6b7280')
+        self.gantt_canvas.create_text(600, 230, text="Add processes to see the Gantt chart", tags="empty",
+                                      font=('Segoe UI', 12), fill='#9ca3af')
+
+    def on_gantt_yview(self, *args):
+        """Scroll the Gantt chart and draw the rows that came into view"""
+        self.gantt_canvas.yview(*args)
+        self.draw_modern_gantt_chart()
+
+    def draw_modern_gantt_chart(self, changed=()):
+        """Draw a modern, colorful Gantt chart.
+
+        Canvas items are retained between frames: each visible row is created
+        once and afterwards only updated through coords()/itemconfig() when
+        its process changed. Rows scrolled out of view have their items
+        deleted, so canvas work follows the visible, changed rows.
+        """
+        canvas = self.gantt_canvas
+        new_pids = sorted(pid for pid in changed
+                          if pid not in self.gantt_row_of and pid in self.core.processes)
+        removed = any(pid in self.gantt_row_of and pid not in self.core.processes for pid in changed)
+
+        if removed:
+            for pid in list(self.gantt_items):
+                self.delete_gantt_row(pid)
+            self.gantt_pids = [p.pid for p in self.core.processes]
+            self.gantt_row_of = {pid: row for row, pid in enumerate(self.gantt_pids)}
+        else:
+            for pid in new_pids:
+                self.gantt_row_of[pid] = len(self.gantt_pids)
+                self.gantt_pids.append(pid)
+
+        if new_pids or removed:
+            canvas.itemconfigure("empty", state='hidden' if self.gantt_pids else 'normal')
+            for pid in new_pids:
+                width = self.core.find_process(pid).sleep_time * self.gantt_scale
+                self.gantt_max_width = max(self.gantt_max_width, width)
+            height = self.gantt_y_start + len(self.gantt_pids) * self.gantt_bar_spacing
+            canvas.configure(scrollregion=(0, 0, self.gantt_x_start + self.gantt_max_width + 150,
+                                           max(height, 400)))
+
+        # Rows intersecting the viewport
+        top = canvas.canvasy(0)
+        bottom = canvas.canvasy(canvas.winfo_height())
+        first = max(0, int((top - self.gantt_y_start) // self.gantt_bar_spacing))
+        last = min(len(self.gantt_pids) - 1, int((bottom - self.gantt_y_start) // self.gantt_bar_spacing))
+
+        for pid in [pid for pid in self.gantt_items if not first <= self.gantt_row_of[pid] <= last]:
+            self.delete_gantt_row(pid)
+
+        for row in range(first, last + 1):
+            pid = self.gantt_pids[row]
+            if pid not in self.gantt_items:
+                self.create_gantt_row(self.core.find_process(pid), row)
+            elif pid in changed:
+                self.update_gantt_row(self.core.find_process(pid), row)
+
+    def create_gantt_row(self, process, row):
+        """Create the canvas items of one Gantt row"""
+        canvas = self.gantt_canvas
+        x_start, bar_height = self.gantt_x_start, self.gantt_bar_height
+        y = self.gantt_y_start + row * self.gantt_bar_spacing
+        total_width = process.sleep_time * self.gantt_scale
+
+        self.gantt_items[process.pid] = {
             # Process label
-            self.gantt_canvas.create_text(50, y + bar_height//2, 
-                                        text=f"P{process.pid}: {process.name}", 
+            'label': canvas.create_text(50, y + bar_height//2,
+                                        text=f"P{process.pid}: {process.name}"
+                                             + (f" 🔁#{process.occurrence}" if process.recurrence else ""),
                                         font=('Segoe UI', 10, 'bold'),
-                                        anchor='e', fill=self.colors['dark'])
-            
+                                        anchor='e', fill=self.colors['dark']),
             # Background bar
-            total_width = process.sleep_time * scale
-            self.gantt_canvas.create_rectangle(x_start, y, x_start + total_width, y + bar_height,
-                                             fill='#e5e7eb', outline='#d1d5db', width=1)
-            
-            # Progress bar
-            if process.progress > 0:
-                progress_width = (process.progress / 100) * total_width
-                color = self.get_status_color(process.status)
-                
-                self.gantt_canvas.create_rectangle(x_start, y, x_start + progress_width, y + bar_height,
-                                                 fill=color, outline=color, width=0)
-                
-                # Add gradient effect (simple)
-                gradient_color = self.lighten_color(color)
-                self.gantt_canvas.create_rectangle(x_start, y, x_start + progress_width, y + bar_height//3,
-                                                 fill=gradient_color, outline='', width=0)
-            
+            'background': canvas.create_rectangle(x_start, y, x_start + total_width, y + bar_height,
+                                                  fill='#e5e7eb', outline='#d1d5db', width=1),
+            # Progress bar with a simple gradient effect
+            'bar': canvas.create_rectangle(x_start, y, x_start, y + bar_height, width=0),
+            'gradient': canvas.create_rectangle(x_start, y, x_start, y + bar_height//3,
+                                                outline='', width=0),
             # Progress text
-            if process.progress > 0:
-                self.gantt_canvas.create_text(x_start + total_width//2, y + bar_height//2,
-                                            text=f"{process.progress}%",
-                                            font=('Segoe UI', 9, 'bold'),
-                                            fill='white' if process.progress > 20 else self.colors['dark'])
-            
+            'percent': canvas.create_text(x_start + total_width//2, y + bar_height//2,
+                                          font=('Segoe UI', 9, 'bold')),
             # Status indicator
-            status_colors = {
-                "Running": "🟢", "Paused": "🟡", "Waiting": "🔵", "Completed": "🟣"
-            }
-            status_emoji = status_colors.get(process.status, "⚪")
-            self.gantt_canvas.create_text(x_start + total_width + 20, y + bar_height//2,
-                                        text=f"{status_emoji} {process.status}",
-                                        font=('Segoe UI', 9), anchor='w',
-                                        fill=self.colors['dark'])
+            'status': canvas.create_text(x_start + total_width + 20, y + bar_height//2,
+                                         font=('Segoe UI', 9), anchor='w',
+                                         fill=self.colors['dark']),
+        }
+        self.gantt_segments[process.pid] = []
+        self.update_gantt_row(process, row)
+
+    def delete_gantt_row(self, pid):
+        self.gantt_canvas.delete(*self.gantt_items.pop(pid).values(), *self.gantt_segments.pop(pid))
+
+    def update_gantt_row(self, process, row):
+        """Refresh the progress and status items of an existing Gantt row"""
+        canvas = self.gantt_canvas
+        items = self.gantt_items[process.pid]
+        x_start, bar_height = self.gantt_x_start, self.gantt_bar_height
+        y = self.gantt_y_start + row * self.gantt_bar_spacing
+        total_width = process.sleep_time * self.gantt_scale
+        state = 'normal' if process.progress > 0 else 'hidden'
+
+        progress_width = (process.progress / 100) * total_width
+        color = self.get_status_color(process.status)
+        canvas.coords(items['bar'], x_start, y, x_start + progress_width, y + bar_height)
+        canvas.itemconfigure(items['bar'], fill=color, outline=color, state=state)
+        canvas.coords(items['gradient'], x_start, y, x_start + progress_width, y + bar_height//3)
+        canvas.itemconfigure(items['gradient'], fill=self.lighten_color(color), state=state)
+
+        canvas.itemconfigure(items['percent'], text=f"{process.progress}%", state=state,
+                             fill='white' if process.progress > 20 else self.colors['dark'])
+
+        status_colors = {
+            "Running": "🟢", "Paused": "🟡", "Waiting": "🔵", "Completed": "🟣", "Failed": "🔴"
+        }
+        status_emoji = status_colors.get(process.status, "⚪")
+        canvas.itemconfigure(items['status'], text=f"{status_emoji} {process.status}")
+
+        self.update_gantt_segments(process, y + bar_height + 2)
+
+    def update_gantt_segments(self, process, y):
+        """Draw the recorded run segments as a timeline strip under the bar.
+
+        The strip starts at the process's first dispatch, so an uninterrupted
+        run exactly spans the bar and every preemption shows up as a gap.
+        """
+        canvas = self.gantt_canvas
+        ids = self.gantt_segments[process.pid]
+        segments = self.core.intervals.segments(process.pid, now=self.core.engine.wall())
+        if not segments:
+            return
+
+        origin = segments[0][0]
+        color = self.get_status_color("Running")
+        # Closed segments never move, so only new ones and the last two need coords
+        first = min(len(ids), max(0, len(segments) - 2))
+        for i in range(len(ids), len(segments)):
+            ids.append(canvas.create_rectangle(0, 0, 0, 0, fill=color, outline='', width=0))
+        for i in range(first, len(segments)):
+            start, end = segments[i]
+            canvas.coords(ids[i],
+                          self.gantt_x_start + (start - origin) * self.gantt_scale, y,
+                          self.gantt_x_start + (end - origin) * self.gantt_scale, y + 5)
 
     def lighten_color(self, color):
         """Lighten a hex color for gradient effect"""
@@ -759,42 +1120,53 @@ class ModernSchedulerApp:
         return color_map.get(color, color)
 
     def log(self, msg):
-        """Add message to log with modern formatting"""
+        """Queue a log line; flush_log() writes the batch once per frame"""
         ts = datetime.datetime.now().strftime("[%H:%M:%S]")
-        formatted_msg = f"{ts} {msg}\n"
-        
-        self.log_box.insert(tk.END, formatted_msg)
+        self.log_pending.append((f"{ts} {msg}\n", self.log_tags.get(msg[:1], "")))
+
+    def flush_log(self):
+        """Insert queued lines in one Tk call and trim the widget to max_log_lines"""
+        if not self.log_pending:
+            return
+        chunks = []
+        for line, tag in self.log_pending:
+            chunks += (line, tag)
+        count = len(self.log_pending)
+        self.log_pending.clear()
+
+        self.log_box.insert(tk.END, *chunks)
+        self.log_lines += count
+        if self.log_lines > self.max_log_lines:
+            excess = self.log_lines - self.max_log_lines
+            self.log_box.delete("1.0", f"{excess + 1}.0")
+            self.log_lines = self.max_log_lines
         self.log_box.see(tk.END)
-        
-        # Color coding for different message types
-        if "✅" in msg or "🎉" in msg:
-            # Success messages in green
-            start_line = self.log_box.index(tk.END + "-2l linestart")
-            end_line = self.log_box.index(tk.END + "-1l lineend")
-            self.log_box.tag_add("success", start_line, end_line)
-            self.log_box.tag_config("success", foreground="#10b981")
-        elif "🔄" in msg or "🚀" in msg or "▶️" in msg:
-            # Update messages in blue
-            start_line = self.log_box.index(tk.END + "-2l linestart")
-            end_line = self.log_box.index(tk.END + "-1l lineend")
-            self.log_box.tag_add("info", start_line, end_line)
-            self.log_box.tag_config("info", foreground="#06b6d4")
 
     def notify(self, message):
-        """Show modern notification"""
-        try:
-            winsound.MessageBeep()
-        except:
-            pass  # Handle case where winsound is not available
-        
-        # Create a modern messagebox style notification
-        messagebox.showinfo("🔔 Notification", message)
-
-if __name__ == "__main__":
+        """Show a toast and forward to the other sinks, rate limited, never blocking"""
+        self.notifier.post(message)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.simulate:
+        from simulation import run_simulation
+        run_simulation(args)
+        return
+    if args.headless:
+        run_headless(args)
+        return
+
+    core = build_core(args)
     root = tk.Tk()
-    app = ModernSchedulerApp(root)
+    app = ModernSchedulerApp(root, core, build_notifier(args), AdaptivePoll(core, args.poll, args.max_poll))
+    app.adaptive_enabled.set(args.adaptive)
+    load_work(core, args)
+    app.schedule()
     root.mainloop()
 
+if __name__ == "__main__":
+    main()
+
 # import tkinter as tk
 # from tkinter import ttk, messagebox, Canvas
 # import datetime
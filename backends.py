@@ -0,0 +1,272 @@
+# # Multiprocess-Alarm-Schedule - real child-process execution backend
+
+import inspect
+import math
+import multiprocessing
+import os
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from multiprocessing.connection import Connection, wait
+
+from scheduler_core import ManagedProcess
+
+
+def _child_main(conn, target, args):
+    """Entry point of a callable job inside the child process"""
+    def report(progress):
+        conn.send(int(progress))
+
+    kwargs = {}
+    try:
+        if "progress" in inspect.signature(target).parameters:
+            kwargs["progress"] = report
+    except (TypeError, ValueError):
+        pass  # Builtins without a signature just don't get progress
+
+    try:
+        target(*args, **kwargs)
+    finally:
+        conn.close()
+
+
+def describe_exit(exitcode):
+    """``exit code N`` or ``killed by SIGNAME`` (a negative code is the signal number)"""
+    if exitcode < 0:
+        try:
+            return f"killed by {signal.Signals(-exitcode).name}"
+        except ValueError:
+            return f"killed by signal {-exitcode}"
+    return f"exit code {exitcode}"
+
+
+class ProcessJob(ManagedProcess):
+    """A managed process whose work runs in a real child process.
+
+    ``target`` is either a callable, run in a forked child and given a
+    ``progress(percent)`` keyword argument if it accepts one, or a command
+    (string or argument list) whose stdout lines of the form
+    ``PROGRESS <percent>`` are reported as progress. ``sleep_time`` holds the
+    expected duration and is only used for display and the remaining-time
+    estimate.
+
+    Jobs are not journaled: a restart can't resume the child, and restoring
+    the row would bring it back as a plain countdown that "completes"
+    without running anything.
+    """
+
+    persistent = False
+
+    def __init__(self, pid, name, target, priority, queue, backend, args=(), expected_time=10):
+        super().__init__(pid, name, expected_time, priority, queue)
+        self.target = target
+        self.args = tuple(args)
+        self.backend = backend
+        self.child = None
+        self.exitcode = None
+
+    def start(self):
+        if self.is_running or self.finished:
+            return
+        self.start_time = self._wall_clock_text()
+        self.queue.put(("gantt_start", self.pid, self.engine.wall()))
+        self.is_running = True
+        try:
+            self.backend.launch(self)
+        except OSError as e:
+            # e.g. no such command: fail the job instead of the scheduling pass
+            self.failure = f"failed to start: {e}"
+            self._finish()
+
+    def pause(self):
+        self.is_paused = True
+        self.backend.send_signal(self, signal.SIGSTOP)
+
+    def resume(self):
+        self.is_paused = False
+        if not self.is_running:
+            self.start()
+        else:
+            self.backend.send_signal(self, signal.SIGCONT)
+
+    def stop(self):
+        self.is_running = False
+        self.backend.terminate(self)
+
+    def _report(self, progress):
+        if not math.isfinite(progress):
+            return
+        self.progress = max(0, min(100, int(progress)))
+        self.remaining = round(self.sleep_time * (100 - self.progress) / 100)
+        self.queue.put(("update", self.pid, self.progress))
+
+    def _exited(self, exitcode):
+        self.exitcode = exitcode
+        if not self.is_running:
+            return  # Stopped on purpose, not a completion
+        if exitcode:
+            # The scheduler reports it as Failed rather than Completed
+            self.failure = describe_exit(exitcode)
+        else:
+            self.remaining = 0
+            self.progress = 100
+            self.queue.put(("update", self.pid, self.progress))
+        self._finish()
+
+
+class ProcessBackend:
+    """Runs ProcessJobs as real child processes supervised by one thread.
+
+    ``workers`` defaults to the number of cores and is the intended
+    ``max_running`` of the scheduler driving this backend. Pause and resume
+    map to SIGSTOP/SIGCONT; stop sends SIGTERM and escalates to SIGKILL after
+    ``term_timeout`` seconds. Progress and exits of every child are collected
+    by a single thread waiting on all pipes and process sentinels at once.
+    """
+
+    def __init__(self, workers=None, term_timeout=3.0):
+        if not hasattr(signal, "SIGSTOP"):
+            raise RuntimeError("ProcessBackend needs POSIX job control signals")
+        self.workers = workers or os.cpu_count() or 1
+        self.term_timeout = term_timeout
+        self._lock = threading.Lock()
+        self._waitables = {}        # pipe, stdout or sentinel -> job
+        self._conns = {}            # job -> progress connection (callables)
+        self._buffers = {}          # job -> partial stdout line (commands)
+        self._reaping = set()       # commands whose stdout hit EOF
+        self._escalations = {}      # job -> SIGKILL deadline
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = None
+
+    def create_job(self, pid, name, target, priority, queue, args=(), expected_time=10):
+        return ProcessJob(pid, name, target, priority, queue, self, args, expected_time)
+
+    def launch(self, job):
+        if callable(job.target):
+            parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+            proc = multiprocessing.Process(target=_child_main, args=(child_conn, job.target, job.args),
+                                           name=f"job-{job.pid}", daemon=True)
+            proc.start()
+            child_conn.close()
+            waitables = {parent_conn: job, proc.sentinel: job}
+        else:
+            cmd = shlex.split(job.target) if isinstance(job.target, str) else list(job.target)
+            proc = subprocess.Popen(cmd + list(job.args), stdout=subprocess.PIPE,
+                                    bufsize=0, start_new_session=True)
+            waitables = {proc.stdout: job}
+
+        job.child = proc
+        with self._lock:
+            self._waitables.update(waitables)
+            if callable(job.target):
+                self._conns[job] = parent_conn
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ProcessBackend", daemon=True)
+                self._thread.start()
+        self._wake()
+
+    def send_signal(self, job, sig):
+        proc = job.child
+        if proc is None or job.exitcode is not None:
+            return
+        try:
+            if isinstance(proc, subprocess.Popen):
+                os.killpg(proc.pid, sig)  # Whole session, including grandchildren
+            else:
+                os.kill(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self, job):
+        if job.child is None or job.exitcode is not None:
+            return
+        self.send_signal(job, signal.SIGCONT)  # A stopped child can't act on SIGTERM
+        self.send_signal(job, signal.SIGTERM)
+        with self._lock:
+            self._escalations[job] = time.monotonic() + self.term_timeout
+        self._wake()
+
+    def _wake(self):
+        os.write(self._wake_w, b"\0")
+
+    def _run(self):
+        while True:
+            with self._lock:
+                watched = list(self._waitables)
+                pending = bool(self._reaping or self._escalations)
+            ready = wait(watched + [self._wake_r], timeout=0.1 if pending else None)
+
+            for obj in ready:
+                if obj == self._wake_r:
+                    os.read(self._wake_r, 4096)
+                    continue
+                job = self._waitables.get(obj)
+                if job is None:
+                    continue
+                if isinstance(obj, Connection):
+                    self._drain_conn(job, obj)
+                elif isinstance(obj, int):
+                    self._drop(obj)
+                    conn = self._conns.get(job)
+                    if conn is not None:
+                        self._drain_conn(job, conn)
+                    job.child.join()
+                    self._reap(job, job.child.exitcode)
+                else:
+                    self._read_stdout(job, obj)
+
+            for job in list(self._reaping):
+                exitcode = job.child.poll()
+                if exitcode is not None:
+                    self._reaping.discard(job)
+                    self._reap(job, exitcode)
+
+            now = time.monotonic()
+            with self._lock:
+                escalations = list(self._escalations.items())
+            for job, deadline in escalations:
+                if job.exitcode is None and now >= deadline:
+                    self.send_signal(job, signal.SIGKILL)
+                if job.exitcode is not None or now >= deadline:
+                    with self._lock:
+                        self._escalations.pop(job, None)
+
+    def _drop(self, obj):
+        with self._lock:
+            self._waitables.pop(obj, None)
+
+    def _drain_conn(self, job, conn):
+        try:
+            while conn.poll():
+                job._report(conn.recv())
+        except (EOFError, OSError):
+            self._drop(conn)
+            self._conns.pop(job, None)
+            conn.close()
+
+    def _read_stdout(self, job, stream):
+        data = os.read(stream.fileno(), 4096)
+        if not data:
+            self._drop(stream)
+            stream.close()
+            self._reaping.add(job)
+            return
+
+        lines = (self._buffers.pop(job, b"") + data).split(b"\n")
+        if lines[-1]:
+            self._buffers[job] = lines[-1]
+        for line in lines[:-1]:
+            parts = line.split()
+            if len(parts) == 2 and parts[0] == b"PROGRESS":
+                try:
+                    job._report(float(parts[1]))
+                except ValueError:
+                    pass
+
+    def _reap(self, job, exitcode):
+        with self._lock:
+            self._escalations.pop(job, None)
+        self._buffers.pop(job, None)
+        job._exited(exitcode)
@@ -0,0 +1,64 @@
+# # Multiprocess-Alarm-Schedule - countdown drift and pause latency benchmark
+#
+# Runs float-duration alarms on a TickEngine while pausing and resuming them
+# at random sub-second points, then compares total run time with the
+# requested duration.
+# Usage: python benchmarks/drift_bench.py [ALARMS] [SECONDS]
+
+import os
+import queue
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from scheduler_core import ManagedProcess, TickEngine
+
+
+def main(argv=None):
+    argv = argv or sys.argv[1:]
+    alarms = int(argv[0]) if argv else 200
+    seconds = float(argv[1]) if len(argv) > 1 else 3.0
+
+    rng = random.Random(7)
+    engine = TickEngine(tick=0.25)
+    events = queue.Queue()
+    procs = [ManagedProcess(i, f"p{i}", seconds + rng.random(), 5, events, engine) for i in range(alarms)]
+    run_time = {p.pid: 0.0 for p in procs}
+    resumed = {}
+
+    for p in procs:
+        p.start()
+        resumed[p.pid] = time.monotonic()
+
+    pause_latency = []
+    while any(not p.finished for p in procs):
+        time.sleep(0.05)
+        for p in rng.sample(procs, max(1, alarms // 10)):
+            if p.finished:
+                continue
+            now = time.monotonic()
+            if p.is_paused:
+                p.resume()
+                resumed[p.pid] = now
+            else:
+                p.pause()
+                pause_latency.append(time.monotonic() - now)
+                run_time[p.pid] += now - resumed[p.pid]
+
+    errors = []
+    for p in procs:
+        if p.finished and not p.is_paused:
+            total = run_time[p.pid] + (p.drift + p._deadline) - resumed[p.pid]
+            errors.append(abs(total - p.sleep_time))
+    drifts = [p.drift for p in procs]
+
+    print(f"alarms: {alarms}, mean duration: {seconds + 0.5:.1f}s")
+    print(f"completion drift  mean {sum(drifts) / len(drifts) * 1e3:.3f} ms  max {max(drifts) * 1e3:.3f} ms")
+    print(f"run-time error    mean {sum(errors) / len(errors) * 1e3:.3f} ms  max {max(errors) * 1e3:.3f} ms")
+    print(f"pause latency     max {max(pause_latency) * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# # Multiprocess-Alarm-Schedule - schedule() decision latency microbenchmark
+#
+# Compares the old list-scanning schedule() with the heap-based run queues,
+# and counts the context switches each one makes per priority change.
+# Usage: python benchmarks/schedule_bench.py [N ...]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from scheduler_core import SchedulerCore
+
+
+class NullEngine:
+    """Tick engine stand-in so the benchmark never starts countdowns"""
+
+    tick = 1.0
+    clock = staticmethod(time.monotonic)
+    wall = staticmethod(time.time)
+
+    def arm(self, process, when):
+        pass
+
+    def disarm(self, process):
+        pass
+
+    def post(self, queue, item):
+        queue.put(item)
+
+
+class SwitchCountingEngine(NullEngine):
+    """NullEngine that records which processes were paused (disarmed)"""
+
+    def __init__(self):
+        self.paused = []
+
+    def disarm(self, process):
+        self.paused.append(process.pid)
+
+
+class LegacyCore(SchedulerCore):
+    """SchedulerCore with the previous O(n log n) scan-and-sort schedule()"""
+
+    def schedule(self):
+        running = [p for p in self.processes if p.status == "Running"]
+        paused = [p for p in self.processes if p.status == "Paused"]
+        waiting = [p for p in self.processes if p.status == "Waiting"]
+        available_slots = self.max_running - len(running)
+
+        if self.preemptive_enabled:
+            all_active = running + paused + waiting
+            all_active = [p for p in all_active if p.status != "Completed"]
+            all_active.sort(key=lambda x: x.priority)
+            for p in running:
+                p.pause()
+            for process in all_active[:self.max_running]:
+                if process.status in ["Paused", "Waiting"]:
+                    if process.status == "Waiting":
+                        process.start()
+                    process.resume()
+                    process.status = "Running"
+            for process in all_active[self.max_running:]:
+                if process.status == "Running":
+                    process.pause()
+                process.status = "Paused"
+        else:
+            if available_slots > 0 and waiting:
+                waiting.sort(key=lambda x: x.priority)
+                for process in waiting[:available_slots]:
+                    process.start()
+                    process.status = "Running"
+            if available_slots > len([p for p in waiting if p.status == "Running"]) and paused:
+                remaining_slots = available_slots - len([p for p in waiting if p.status == "Running"])
+                paused.sort(key=lambda x: x.priority)
+                for process in paused[:remaining_slots]:
+                    process.resume()
+                    process.status = "Running"
+
+
+def bench(core_cls, n, decisions=50, seed=42):
+    """Return mean seconds per schedule() pass after a priority change"""
+    rng = random.Random(seed)
+    core = core_cls(max_running=4, preemptive=True, engine=NullEngine())
+    for i in range(n):
+        core.add_process(f"p{i}", 3600, rng.randint(1, 10))
+    core.schedule()
+
+    total = 0.0
+    for _ in range(decisions):
+        core.change_priority(rng.randint(1, n), rng.randint(1, 10))
+        start = time.perf_counter()
+        core.schedule()
+        total += time.perf_counter() - start
+    return total / decisions
+
+
+def running_pids(core):
+    return {p.pid for p in core.processes if p.status == "Running"}
+
+
+def bench_switches(core_cls, n, decisions=50, seed=42):
+    """Return (context switches per decision, switches of processes that stayed running).
+
+    Every other change demotes a running process, so some of the decisions
+    must swap exactly one process.
+    """
+    rng = random.Random(seed)
+    engine = SwitchCountingEngine()
+    core = core_cls(max_running=4, preemptive=True, engine=engine)
+    for i in range(n):
+        core.add_process(f"p{i}", 3600, rng.randint(1, 10))
+    core.schedule()
+
+    switches = interrupted = 0
+    for i in range(decisions):
+        before = running_pids(core)
+        if i % 2:
+            core.change_priority(rng.choice(sorted(before)), 10)
+        else:
+            core.change_priority(rng.randint(1, n), rng.randint(1, 10))
+        engine.paused.clear()
+        core.schedule()
+        kept = before & running_pids(core)
+        switches += len(engine.paused)
+        interrupted += sum(1 for pid in engine.paused if pid in kept)
+    return switches / decisions, interrupted
+
+
+def main(argv=None):
+    sizes = [int(a) for a in (argv or sys.argv[1:])] or [1000, 10000, 100000]
+    print(f"{'processes':>10} {'legacy (ms)':>12} {'heap (ms)':>10} {'speedup':>8}")
+    for n in sizes:
+        legacy = bench(LegacyCore, n, decisions=10 if n >= 100000 else 50)
+        heap = bench(SchedulerCore, n)
+        print(f"{n:>10} {legacy * 1e3:>12.3f} {heap * 1e3:>10.4f} {legacy / heap:>7.0f}x")
+
+    n = min(sizes)
+    print(f"\ncontext switches per priority change ({n} processes, 4 running)")
+    print(f"{'':>10} {'switches':>10} {'kept running but interrupted':>30}")
+    for label, core_cls in (("legacy", LegacyCore), ("heap", SchedulerCore)):
+        per_decision, interrupted = bench_switches(core_cls, n)
+        print(f"{label:>10} {per_decision:>10.2f} {interrupted:>30}")
+
+
+if __name__ == "__main__":
+    main()
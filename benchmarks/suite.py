@@ -0,0 +1,288 @@
+# # Multiprocess-Alarm-Schedule - benchmark suite with JSON results
+#
+# Synthetic workloads of 100 to 100k processes with mixed priorities. For
+# each size it measures schedule() decision latency, event queue drain
+# throughput (the per-frame drain in update_gui), tree and Gantt frame times
+# on a real Tk display, traced memory per process and the thread count with
+# every process running. Rendering runs on $DISPLAY, or on a private Xvfb
+# server when one is installed; otherwise it is reported as skipped.
+#
+# Usage: python benchmarks/suite.py [--sizes N ...] [--output FILE] [--compare OLD.json]
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from schedule_bench import NullEngine
+from scheduler_core import SchedulerCore, TickEngine
+
+SEED = 1234
+ENGINE = TickEngine()           # shared, as in the app, so sizes don't leak driver threads
+
+# Metrics compared by --compare; all of them are "lower is better"
+COMPARED = [
+    ("schedule", "mean_us"),
+    ("schedule", "p99_us"),
+    ("drain", "us_per_event"),
+    ("render", "tree_frame_ms"),
+    ("render", "gantt_frame_ms"),
+    ("memory", "bytes_per_process"),
+    ("threads", "running"),
+]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def make_core(n, rng, engine=None, max_running=8):
+    core = SchedulerCore(max_running=max_running, preemptive=True, engine=engine or NullEngine())
+    core.add_processes((f"p{i}", rng.uniform(60, 3600), rng.randint(1, 10)) for i in range(n))
+    return core
+
+
+def bench_schedule(n, decisions=500):
+    """Latency of one schedule() pass after a random priority change"""
+    rng = random.Random(SEED)
+    core = make_core(n, rng)
+    core.schedule()
+    samples = []
+    for _ in range(decisions):
+        core.change_priority(rng.randint(1, n), rng.randint(1, 10))
+        start = time.perf_counter()
+        core.schedule()
+        samples.append(time.perf_counter() - start)
+    return {
+        "decisions": decisions,
+        "mean_us": statistics.mean(samples) * 1e6,
+        "p50_us": percentile(samples, 0.5) * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+    }
+
+
+def bench_drain(n, budget=0.05):
+    """Events per second through process_events() with the GUI's frame budget"""
+    rng = random.Random(SEED)
+    core = make_core(n, rng)
+    core.schedule()
+    events = min(10 * n, 200_000)
+    for _ in range(events):
+        pid = rng.randint(1, n)
+        core.queue.put(("update", pid, rng.randint(0, 99)))
+
+    frames = 0
+    start = time.perf_counter()
+    while core.queue.qsize():
+        core.process_events(budget=budget)
+        frames += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "events": events,
+        "frames": frames,
+        "events_per_s": events / elapsed,
+        "us_per_event": elapsed / events * 1e6,
+        "coalesced": core.events_coalesced,
+    }
+
+
+def bench_memory(n):
+    """Traced bytes allocated per registered, queued process"""
+    rng = random.Random(SEED)
+    specs = [(f"p{i}", rng.uniform(60, 3600), rng.randint(1, 10)) for i in range(n)]
+    core = SchedulerCore(max_running=8, engine=NullEngine())
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        core.add_processes(specs)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return {"bytes_per_process": (after - before) / n}
+
+
+def bench_threads(n):
+    """Threads alive while all ``n`` processes count down at once"""
+    core = make_core(n, random.Random(SEED), engine=ENGINE, max_running=n)
+    core.schedule()
+    running = threading.active_count()
+    for p in core.processes:
+        p.stop()
+    return {"running": running, "counting_down": len(core.running)}
+
+
+def start_display():
+    """Make sure Tk has a display; return the Xvfb process we started, if any"""
+    if os.environ.get("DISPLAY"):
+        return None
+    if shutil.which("Xvfb") is None:
+        raise RuntimeError("no $DISPLAY and Xvfb is not installed")
+    display = ":97"
+    server = subprocess.Popen(["Xvfb", display, "-screen", "0", "1600x1200x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(1.0)
+    return server
+
+
+def bench_render(n, frames=20, churn=0.01):
+    """Tree and Gantt frame times: the first full build, then steady frames
+    in which ``churn`` of the processes changed"""
+    import tkinter as tk
+    from app import ModernSchedulerApp
+
+    rng = random.Random(SEED)
+    root = tk.Tk()
+    try:
+        # The app renders its first frame in __init__, so start it empty
+        core = make_core(0, rng)
+        app = ModernSchedulerApp(root, core)
+        root.update()
+        core.add_processes((f"p{i}", rng.uniform(60, 3600), rng.randint(1, 10)) for i in range(n))
+        core.schedule()
+
+        changed = core.take_changed()
+        start = time.perf_counter()
+        app.update_process_tree(changed)
+        root.update_idletasks()
+        tree_first = time.perf_counter() - start
+        start = time.perf_counter()
+        app.draw_modern_gantt_chart(changed)
+        root.update_idletasks()
+        gantt_first = time.perf_counter() - start
+
+        tree_times, gantt_times = [], []
+        for _ in range(frames):
+            for _ in range(max(1, int(n * churn))):
+                core.handle_event(("update", rng.randint(1, n), rng.randint(0, 99)))
+            changed = core.take_changed()
+            start = time.perf_counter()
+            app.update_process_tree(changed)
+            root.update_idletasks()
+            tree_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            app.draw_modern_gantt_chart(changed)
+            root.update_idletasks()
+            gantt_times.append(time.perf_counter() - start)
+    finally:
+        root.destroy()
+
+    return {
+        "tree_first_ms": tree_first * 1e3,
+        "gantt_first_ms": gantt_first * 1e3,
+        "tree_frame_ms": statistics.mean(tree_times) * 1e3,
+        "gantt_frame_ms": statistics.mean(gantt_times) * 1e3,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, render=True):
+    server = None
+    render_error = None
+    if render:
+        try:
+            server = start_display()
+        except RuntimeError as e:
+            render_error = str(e)
+
+    results = []
+    try:
+        for n in sizes:
+            print(f"benchmarking {n} processes...", file=sys.stderr)
+            entry = {
+                "processes": n,
+                "schedule": bench_schedule(n),
+                "drain": bench_drain(n),
+                "memory": bench_memory(n),
+                "threads": bench_threads(n),
+            }
+            if render and render_error is None:
+                try:
+                    entry["render"] = bench_render(n)
+                except Exception as e:  # e.g. a display that refuses connections
+                    render_error = f"{type(e).__name__}: {e}"
+            if "render" not in entry:
+                entry["render"] = {"skipped": render_error or "disabled"}
+            results.append(entry)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    return {
+        "revision": git_revision(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare(old, new, threshold):
+    """Print metric ratios new/old; return the regressions above ``threshold``"""
+    regressions = []
+    old_by_size = {entry["processes"]: entry for entry in old["results"]}
+    for entry in new["results"]:
+        previous = old_by_size.get(entry["processes"])
+        if previous is None:
+            continue
+        for section, metric in COMPARED:
+            before = previous.get(section, {}).get(metric)
+            after = entry.get(section, {}).get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"{entry['processes']:>7} {section}.{metric:<18} {before:>12.2f} -> {after:>12.2f}"
+                  f"  x{ratio:.2f}{flag}")
+            if flag:
+                regressions.append((entry["processes"], section, metric, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scheduler benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10_000, 100_000])
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--no-render", action="store_true", help="skip the Tk frame time benchmarks")
+    parser.add_argument("--compare", metavar="OLD.json",
+                        help="compare with earlier results; exit 1 on a regression")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio counted as a regression (default: 1.25)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, render=not args.no_render)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        if compare(old, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
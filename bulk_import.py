@@ -0,0 +1,113 @@
+# # Multiprocess-Alarm-Schedule - streaming bulk import of alarm definitions
+
+import csv
+import itertools
+import json
+import math
+import os
+
+from recurrence import compile_schedule
+from timers import parse_when
+
+
+def read_records(path):
+    """Yield one dict per alarm definition from a .csv or .jsonl file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        yield None
+
+
+def parse_alarms(records, stats):
+    """Turn records into (name, seconds, priority, fire_at, repeat) tuples, counting bad ones in ``stats``.
+
+    ``fire_at`` comes from an optional ``at`` field (see timers.parse_when)
+    and is None for alarms that should be submitted right away. ``repeat``
+    is an optional cron or ``@every`` schedule (see recurrence.py); with
+    it, ``fire_at`` is the first occurrence.
+    """
+    for record in records:
+        try:
+            name = str(record["name"]).strip()
+            for key in ("seconds", "sleep_time", "time"):
+                seconds = record.get(key)
+                if seconds not in (None, ""):
+                    break
+            seconds = float(seconds)
+            if not math.isfinite(seconds) or seconds < 0:
+                raise ValueError(f"invalid duration {seconds}")
+            priority = record.get("priority")
+            priority = 5 if priority in (None, "") else int(priority)
+            at = record.get("at")
+            fire_at = None if at in (None, "") else parse_when(at)
+            repeat = record.get("repeat") or None
+            if repeat is not None:
+                compile_schedule(repeat)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            name = None
+        if not name:
+            stats["invalid"] += 1
+            continue
+        yield name, seconds, priority, fire_at, repeat
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_import(core, path, chunk_size=10_000):
+    """Stream alarms from ``path`` into ``core`` one chunk at a time.
+
+    Yields the running total after each chunk so a caller (e.g. the Tk loop)
+    can interleave other work. Only one chunk is held in memory, nothing is
+    scheduled while loading, and a single summary is logged at the end.
+    Rows with an ``at`` time or a ``repeat`` schedule go to the core's timer
+    store instead of the process list.
+    """
+    stats = {"invalid": 0}
+    total = later = recurring = 0
+    for chunk in chunked(parse_alarms(read_records(path), stats), chunk_size):
+        now, at, repeat = [], [], []
+        for name, seconds, priority, fire_at, schedule in chunk:
+            if schedule is not None:
+                repeat.append((name, seconds, priority, schedule, fire_at))
+            elif fire_at is not None:
+                at.append((fire_at, name, seconds, priority))
+            else:
+                now.append((name, seconds, priority))
+        if now:
+            core.add_processes(now)
+        if at:
+            core.add_alarms_at(at)
+        if repeat:
+            core.add_recurring_many(repeat)
+        total += len(chunk)
+        later += len(at)
+        recurring += len(repeat)
+        yield total
+
+    skipped = f" ({stats['invalid']} invalid rows skipped)" if stats["invalid"] else ""
+    scheduled = f", {later} of them set for later" if later else ""
+    repeating = f", {recurring} recurring" if recurring else ""
+    core.log(f"📥 Imported {total} processes from {os.path.basename(path)}{scheduled}{repeating}{skipped}")
+    core.notify(f"📥 {total} processes imported!")
+
+
+def import_alarms(core, path, chunk_size=10_000):
+    """Import a whole file; return the number of processes added"""
+    total = 0
+    for total in iter_import(core, path, chunk_size):
+        pass
+    return total
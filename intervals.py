@@ -0,0 +1,113 @@
+# # Multiprocess-Alarm-Schedule - execution interval store
+
+from array import array
+import bisect
+
+
+class IntervalStore:
+    """Running segments of every process, kept in flat typed arrays.
+
+    A segment is opened when a process is dispatched and closed when it is
+    preempted or finishes. Closed segments are appended to parallel
+    ``array`` columns (pid, start, end) in closing order. That is not quite
+    end order: a completion is closed when its event is drained, at the
+    earlier completion time, possibly after a later preemption was closed.
+    ``_reach`` holds the running maximum of the ends, which is sorted, so
+    a bisect finds the first segment that can end after t0. Starts are not
+    sorted either, so ``_block_min`` keeps the earliest start of every
+    ``BLOCK`` consecutive segments: blocks starting after t1 are skipped with
+    one comparison each, and a query costs about the segments in its window
+    plus one comparison per later block. Each pid also keeps an ``array`` of
+    its segment numbers. Once more than
+    ``max_segments`` closed segments are held, the oldest half is dropped,
+    which bounds memory for long-running daemons.
+    """
+
+    BLOCK = 1024
+
+    def __init__(self, max_segments=100_000):
+        self.max_segments = max_segments
+        self._pids = array('q')
+        self._starts = array('d')
+        self._ends = array('d')
+        self._reach = array('d')    # max(_ends[:i + 1])
+        self._base = 0              # segment number of _pids[0]
+        self._block_min = array('d')    # earliest start of each block of BLOCK segments
+        self._block_base = 0        # block number of _block_min[0]
+        self._by_pid = {}           # pid -> array of segment numbers
+        self._open = {}             # pid -> start of the running segment
+
+    def __len__(self):
+        return len(self._pids)
+
+    def open(self, pid, t):
+        if pid not in self._open:
+            self._open[pid] = t
+
+    def close(self, pid, t):
+        start = self._open.pop(pid, None)
+        if start is None:
+            return
+        number = self._base + len(self._pids)
+        self._by_pid.setdefault(pid, array('q')).append(number)
+        block = number // self.BLOCK - self._block_base
+        if block == len(self._block_min):
+            self._block_min.append(start)
+        elif start < self._block_min[block]:
+            self._block_min[block] = start
+        self._pids.append(pid)
+        self._starts.append(start)
+        end = max(t, start)
+        self._ends.append(end)
+        self._reach.append(max(end, self._reach[-1]) if self._reach else end)
+        if len(self._pids) > self.max_segments:
+            self._trim(len(self._pids) // 2)
+
+    def is_open(self, pid):
+        return pid in self._open
+
+    def segments(self, pid, now=None):
+        """(start, end) segments of a pid; a running segment ends at ``now``"""
+        result = [(self._starts[n - self._base], self._ends[n - self._base])
+                  for n in self._by_pid.get(pid, ())]
+        if pid in self._open and now is not None:
+            result.append((self._open[pid], now))
+        return result
+
+    def query(self, t0, t1, now=None):
+        """(pid, start, end) of every segment overlapping [t0, t1]"""
+        result = []
+        size = self.BLOCK
+        count = len(self._ends)
+        i = bisect.bisect_right(self._reach, t0)
+        while i < count:
+            block = (self._base + i) // size
+            stop = min(count, (block + 1) * size - self._base)
+            if self._block_min[block - self._block_base] <= t1:
+                for j in range(i, stop):
+                    if self._ends[j] > t0 and self._starts[j] <= t1:
+                        result.append((self._pids[j], self._starts[j], self._ends[j]))
+            i = stop
+        if now is not None:
+            for pid, start in self._open.items():
+                if start <= t1 and now >= t0:
+                    result.append((pid, start, now))
+        return result
+
+    def _trim(self, count):
+        """Forget the ``count`` oldest closed segments"""
+        del self._pids[:count]
+        del self._starts[:count]
+        del self._ends[:count]
+        del self._reach[:count]     # Still sorted, and still an upper bound on the ends before each one
+        self._base += count
+        drop = self._base // self.BLOCK - self._block_base
+        del self._block_min[:drop]  # A partly trimmed block keeps its minimum, still a lower bound
+        self._block_base += drop
+        for pid in list(self._by_pid):
+            numbers = self._by_pid[pid]
+            keep = bisect.bisect_left(numbers, self._base)
+            if keep == len(numbers):
+                del self._by_pid[pid]
+            elif keep:
+                del numbers[:keep]
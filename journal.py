@@ -0,0 +1,168 @@
+# # Multiprocess-Alarm-Schedule - crash-safe state journal
+
+import json
+import os
+import threading
+
+
+class Journal:
+    """Write-ahead journal of scheduler state transitions with snapshots.
+
+    ``record()`` only appends an operation tuple to an in-memory batch, so it
+    is cheap enough to call from the Tk thread. A writer thread appends each
+    batch to ``wal.jsonl`` as JSON lines and fsyncs it every
+    ``flush_interval`` seconds, then applies the batch to its own mirror of
+    the scheduler state. Every ``snapshot_every`` records the mirror is
+    written to ``snapshot.json`` (atomically, via rename) and the WAL is
+    truncated, so recovery only replays a bounded tail.
+
+    Operations (all keyed by pid):
+        ("add", pid, name, sleep_time, priority)
+        ("priority", pid, priority)
+        ("status", pid, status, remaining, progress, start_time, end_time)
+        ("progress", pid, remaining, progress)
+        ("remove", pid)
+
+    Recovered rows are ``[pid, name, sleep_time, priority, status,
+    remaining, progress, start_time, end_time]``.
+    """
+
+    SNAPSHOT = "snapshot.json"
+    WAL = "wal.jsonl"
+
+    def __init__(self, directory, flush_interval=0.2, snapshot_every=50_000):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT)
+        self.wal_path = os.path.join(directory, self.WAL)
+
+        self.state = {}             # pid -> row, mirror of the scheduler state
+        self.pid_counter = 1
+        self._since_snapshot = self._load()
+
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._wal = open(self.wal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="Journal", daemon=True)
+        self._thread.start()
+
+    def recover(self):
+        """Return (pid_counter, rows) as recovered when the journal was opened"""
+        return self.pid_counter, sorted(self.state.values())
+
+    def record(self, *op):
+        with self._lock:
+            self._pending.append(op)
+            if len(self._pending) >= 10_000:
+                self._wake.set()
+
+    def close(self):
+        """Flush everything still pending and stop the writer thread"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._wal.close()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            closed = self._closed  # Read before flushing so nothing is left behind
+            self._flush()
+            if closed:
+                return
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self._wal.write("".join(json.dumps(op, separators=(",", ":")) + "\n" for op in batch))
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+
+        for op in batch:
+            self._apply(op)
+        self._since_snapshot += len(batch)
+        if self._since_snapshot >= self.snapshot_every:
+            self._snapshot()
+
+    def _apply(self, op):
+        kind, pid = op[0], op[1]
+        self.pid_counter = max(self.pid_counter, pid + 1)
+        if kind == "add":
+            self.state[pid] = [pid, op[2], op[3], op[4], "Waiting", op[3], 0, None, None]
+            return
+
+        row = self.state.get(pid)
+        if row is None:
+            return
+        if kind == "priority":
+            row[3] = op[2]
+        elif kind == "status":
+            row[4:9] = op[2:7]
+        elif kind == "progress":
+            row[5:7] = op[2:4]
+        elif kind == "remove":
+            del self.state[pid]
+
+    def _snapshot(self):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"pid_counter": self.pid_counter, "processes": list(self.state.values())},
+                      f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # Replaying the old WAL over the new snapshot would be harmless, since
+        # every operation sets absolute values, so a crash here loses nothing
+        self._wal.close()
+        self._wal = open(self.wal_path, "w", encoding="utf-8")
+        os.fsync(self._wal.fileno())
+        self._since_snapshot = 0
+
+    def _load(self):
+        """Load the snapshot and replay the WAL; return the number of WAL records"""
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.pid_counter = data["pid_counter"]
+            self.state = {row[0]: row for row in data["processes"]}
+
+        if not os.path.exists(self.wal_path):
+            return 0
+
+        with open(self.wal_path, "rb") as f:
+            data = f.read()
+        # Fast path: every complete line parses as one JSON array; a partial
+        # last line is a torn write from a crash
+        complete = data[:data.rfind(b"\n") + 1]
+        try:
+            ops = json.loads(b"[" + complete[:-1].replace(b"\n", b",") + b"]")
+        except ValueError:
+            ops = None
+
+        if ops is None:
+            ops = []
+            good = 0
+            for line in complete.splitlines(keepends=True):
+                try:
+                    ops.append(json.loads(line))
+                except ValueError:
+                    break
+                good += len(line)
+            complete = complete[:good]
+
+        for op in ops:
+            self._apply(op)
+        if len(complete) != len(data):
+            # Cut the torn tail so new records don't land behind it
+            with open(self.wal_path, "r+b") as f:
+                f.truncate(len(complete))
+        return len(ops)
@@ -0,0 +1,36 @@
+# # Multiprocess-Alarm-Schedule - rotated on-disk system log
+
+import logging
+import logging.handlers
+import queue as thread_queue
+
+
+class RotatingLog:
+    """Full system log history written to rotated files off the caller's thread.
+
+    ``write()`` only timestamps the line and puts it on a queue; a
+    ``QueueListener`` thread appends it to ``path``, which is rotated to
+    ``path.1`` ... ``path.<backups>`` when it exceeds ``max_bytes``.
+    """
+
+    def __init__(self, path, max_bytes=10_000_000, backups=5):
+        self.path = path
+        self._queue = thread_queue.SimpleQueue()
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes,
+                                                       backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
+        self._handler = handler
+
+        # A private, non-propagating logger keeps these lines out of the root logger
+        self._logger = logging.Logger(f"scheduler.{path}")
+        self._logger.addHandler(logging.handlers.QueueHandler(self._queue))
+        self._listener = logging.handlers.QueueListener(self._queue, handler)
+        self._listener.start()
+
+    def write(self, message):
+        self._logger.info(message)
+
+    def close(self):
+        """Write what is still queued, then stop the writer thread"""
+        self._listener.stop()
+        self._handler.close()
@@ -0,0 +1,204 @@
+# # Multiprocess-Alarm-Schedule - metrics registry and exporters
+
+import bisect
+import http.server
+import json
+import math
+import os
+import threading
+import time
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Monotonically increasing count; ``fn`` reads it from elsewhere at collection time"""
+
+    kind = "counter"
+
+    def __init__(self, name, description, fn=None):
+        self.name = name
+        self.description = description
+        self.fn = fn
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def collect(self):
+        return self.fn() if self.fn is not None else self.value
+
+
+class Gauge:
+    """Value that goes up and down.
+
+    With ``fn`` the value is computed only when collected, so it costs
+    nothing between scrapes. With ``label``, ``fn`` returns a dict of
+    label value -> value.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, description, fn=None, label=None):
+        self.name = name
+        self.description = description
+        self.fn = fn
+        self.label = label
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def collect(self):
+        return self.fn() if self.fn is not None else self.value
+
+
+class Histogram:
+    """Distribution of observations in fixed cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name, description, buckets):
+        self.name = name
+        self.description = description
+        self.bounds = sorted(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def collect(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.bounds + [math.inf], list(self.counts)):
+            cumulative += count
+            buckets[_format_value(bound)] = cumulative
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+# Bucket bounds in seconds
+LATENCY_BUCKETS = [0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5]
+DURATION_BUCKETS = [0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800, 3600, 86400]
+REFILL_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2]
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms, rendered as Prometheus text or JSON"""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name!r} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, description, fn=None):
+        return self._register(Counter(name, description, fn))
+
+    def gauge(self, name, description, fn=None, label=None):
+        return self._register(Gauge(name, description, fn, label))
+
+    def histogram(self, name, description, buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, description, buckets))
+
+    def snapshot(self):
+        return {
+            "time": time.time(),
+            "metrics": {name: metric.collect() for name, metric in self.metrics.items()},
+        }
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.description}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            value = metric.collect()
+            if metric.kind == "histogram":
+                for bound, count in value["buckets"].items():
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+                lines.append(f"{name}_sum {_format_value(value['sum'])}")
+                lines.append(f"{name}_count {value['count']}")
+            elif getattr(metric, "label", None):
+                for label_value, v in value.items():
+                    lines.append(f'{name}{{{metric.label}="{label_value}"}} {_format_value(v)}')
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serve ``/metrics`` in Prometheus text format on a local port"""
+
+    def __init__(self, registry, port, host="127.0.0.1"):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = self.server.registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood stderr
+
+        self.httpd = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.registry = registry
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class SnapshotWriter:
+    """Write ``registry.snapshot()`` as JSON to ``path`` every ``interval`` seconds"""
+
+    def __init__(self, registry, path, interval=10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="MetricsSnapshot", daemon=True)
+        self._thread.start()
+
+    def write(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.registry.snapshot(), f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        """Stop and write one last snapshot"""
+        self._stop.set()
+        self._thread.join()
+        self.write()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                pass  # Disk trouble must not stop the scheduler; try again next time
@@ -0,0 +1,223 @@
+# # Multiprocess-Alarm-Schedule - rate-limited notifications and their sinks
+
+import datetime
+import json
+import queue as thread_queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+
+# Messages held back by the rate limit are summarised per category
+DIGEST_CATEGORIES = [
+    (re.compile(r"finished execution"), "processes completed"),
+    (re.compile(r"Process \d+ failed"), "processes failed"),
+    (re.compile(r"added successfully"), "processes added"),
+    (re.compile(r"Priority of Process"), "priority changes"),
+    (re.compile(r"imported"), "imports finished"),
+]
+
+
+def digest_category(message):
+    for pattern, label in DIGEST_CATEGORIES:
+        if pattern.search(message):
+            return label
+    return "notifications"
+
+
+class Notifier:
+    """Fan notifications out to pluggable sinks without ever blocking.
+
+    At most ``rate`` notifications per ``window`` seconds are delivered one
+    by one. Anything beyond that is counted per category and delivered as a
+    single digest ("12 processes completed") once the window closes, so
+    a burst of completions produces a handful of messages instead of one per
+    process. ``flush()`` closes elapsed windows and must be called
+    periodically (the GUI does it every frame).
+
+    A sink is any object with ``emit(message)`` and optionally ``close()``.
+    Sinks are called on the caller's thread, so sinks doing I/O should
+    derive from ``BackgroundSink``.
+    """
+
+    def __init__(self, sinks=(), rate=3, window=1.0, clock=time.monotonic):
+        self.sinks = list(sinks)
+        self.rate = rate
+        self.window = window
+        self.clock = clock
+        self._window_start = None
+        self._sent = 0              # notifications delivered in the current window
+        self._held = {}             # category -> notifications held back
+        self.delivered = 0
+        self.digested = 0
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def post(self, message, now=None):
+        now = self.clock() if now is None else now
+        self.flush(now)
+        if self._window_start is None:
+            self._window_start = now
+        if self._sent < self.rate:
+            self._sent += 1
+            self._deliver(message)
+        else:
+            category = digest_category(message)
+            self._held[category] = self._held.get(category, 0) + 1
+
+    def flush(self, now=None, force=False):
+        """Deliver digests of a window that has ended (or any, with ``force``)"""
+        if self._window_start is None:
+            return
+        now = self.clock() if now is None else now
+        if not force and now - self._window_start < self.window:
+            return
+        held, self._held = self._held, {}
+        self._window_start = None
+        self._sent = 0
+        for category, count in held.items():
+            self.digested += count
+            self._deliver(f"{count} {category}")
+
+    def close(self):
+        self.flush(force=True)
+        for sink in self.sinks:
+            close = getattr(sink, "close", None)
+            if close is not None:
+                close()
+
+    def _deliver(self, message):
+        self.delivered += 1
+        for sink in self.sinks:
+            sink.emit(message)
+
+
+class CallbackSink:
+    """Pass notifications to a plain function"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def emit(self, message):
+        self.callback(message)
+
+
+class BackgroundSink:
+    """Base for sinks doing blocking I/O: ``emit`` only enqueues.
+
+    A daemon thread calls ``deliver(message)`` for each queued message.
+    At most ``maxsize`` messages are buffered; further ones are dropped and
+    counted, so a stuck endpoint can't grow memory without bound.
+    """
+
+    def __init__(self, maxsize=1000):
+        self._queue = thread_queue.Queue(maxsize)
+        self.dropped = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def emit(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except thread_queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=2.0):
+        """Deliver what is queued (waiting at most ``timeout``) and stop"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except thread_queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def deliver(self, message):
+        raise NotImplementedError
+
+    def _run(self):
+        while True:
+            message = self._queue.get()
+            if message is None:
+                return
+            try:
+                self.deliver(message)
+            except Exception:
+                self.errors += 1  # A failing sink must never take the scheduler down
+
+
+class LogFileSink(BackgroundSink):
+    """Append timestamped notifications to a text file"""
+
+    def __init__(self, path, maxsize=1000):
+        self.path = path
+        super().__init__(maxsize)
+
+    def deliver(self, message):
+        ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(f"[{ts}] {message}\n")
+
+
+def is_local_url(url):
+    parts = urllib.parse.urlsplit(url)
+    return parts.scheme in ("http", "https") and parts.hostname in ("localhost", "127.0.0.1", "::1")
+
+
+class WebhookSink(BackgroundSink):
+    """POST each notification as JSON to a webhook on this machine"""
+
+    def __init__(self, url, timeout=2.0, maxsize=1000):
+        if not is_local_url(url):
+            raise ValueError(f"webhook must be an http(s) URL on localhost, got {url!r}")
+        self.url = url
+        self.timeout = timeout
+        super().__init__(maxsize)
+
+    def deliver(self, message):
+        body = json.dumps({"message": message, "time": time.time()}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body,
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class DesktopSink(BackgroundSink):
+    """Native desktop notifications via ``notify-send`` (Linux) or ``osascript`` (macOS)"""
+
+    def __init__(self, title="Process Scheduler", maxsize=100):
+        self.title = title
+        if shutil.which("notify-send"):
+            self.command = lambda message: ["notify-send", self.title, message]
+        elif shutil.which("osascript"):
+            self.command = lambda message: [
+                "osascript", "-e",
+                f"display notification {json.dumps(message)} with title {json.dumps(self.title)}"]
+        else:
+            raise RuntimeError("no desktop notification tool (notify-send or osascript) found")
+        super().__init__(maxsize)
+
+    def deliver(self, message):
+        subprocess.run(self.command(message), timeout=5, check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def build_notifier(args, sinks=()):
+    """Create a Notifier with the sinks selected on the command line"""
+    notifier = Notifier(sinks, rate=args.notify_rate)
+    if args.notify_log:
+        notifier.add_sink(LogFileSink(args.notify_log))
+    if args.notify_webhook:
+        notifier.add_sink(WebhookSink(args.notify_webhook))
+    if args.desktop_notify:
+        notifier.add_sink(DesktopSink())
+    return notifier
@@ -0,0 +1,253 @@
+# # Multiprocess-Alarm-Schedule - pluggable scheduling policies
+
+import math
+
+
+class SchedulingPolicy:
+    """Decides which ready process runs next and when a running one yields.
+
+    SchedulerCore keeps its waiting, paused and running sets in heaps
+    ordered by ``ready_key()`` and ``running_key()``; keys are tuples of
+    numbers and must stay fixed while a process sits in a heap, unless
+    ``dynamic_running`` is set, in which case running keys are refreshed
+    at the start of every pass. A ``preemptive`` policy swaps in a ready
+    process whenever ``outranks(candidate, victim, now)``. A policy with a
+    ``quantum`` is time sliced: a process that ran for
+    ``quantum_for(process)`` seconds yields to ready work, and the driver
+    must call ``schedule()`` periodically.
+
+    Each policy keeps its own completion statistics, so policies can be
+    compared on the same load with ``report()``.
+    """
+
+    name = "policy"
+    quantum = None
+    dynamic_running = False
+    waiting_first = False       # Non-preemptive legacy order: never-started work before paused
+
+    def __init__(self, preemptive=True):
+        self.preemptive = preemptive
+        self.started_at = None
+        self.completed = 0
+        self.total_turnaround = 0.0
+        self.total_waiting = 0.0
+
+    @property
+    def time_sliced(self):
+        return self.quantum is not None
+
+    def ready_key(self, process):
+        raise NotImplementedError
+
+    def running_key(self, process):
+        return self.ready_key(process)
+
+    def outranks(self, candidate, victim, now):
+        return self.ready_key(candidate) < self.running_key(victim)
+
+    def quantum_for(self, process):
+        return self.quantum
+
+    def on_expire(self, process):
+        """A running process used up its time slice"""
+
+    def maybe_rekey(self, now):
+        """Return True if ready keys changed and the queues must be rebuilt"""
+        return False
+
+    def forget(self, process):
+        """A process left the scheduler"""
+
+    def record_completion(self, turnaround, waiting):
+        self.completed += 1
+        self.total_turnaround += turnaround
+        self.total_waiting += waiting
+
+    def report(self, now):
+        """Throughput (completions/s), average turnaround and waiting time (s)"""
+        elapsed = now - self.started_at if self.started_at is not None else 0.0
+        return {
+            "policy": self.describe(),
+            "completed": self.completed,
+            "throughput": self.completed / elapsed if elapsed > 0 else 0.0,
+            "avg_turnaround": self.total_turnaround / self.completed if self.completed else 0.0,
+            "avg_waiting": self.total_waiting / self.completed if self.completed else 0.0,
+        }
+
+    def describe(self):
+        return self.name
+
+
+class PriorityPolicy(SchedulingPolicy):
+    """Lowest priority number first; the original preemptive / FIFO-with-priority modes"""
+
+    name = "priority"
+
+    def __init__(self, preemptive=False):
+        super().__init__(preemptive)
+
+    @property
+    def waiting_first(self):
+        return not self.preemptive
+
+    def ready_key(self, process):
+        return (process.priority, process.pid)
+
+    def outranks(self, candidate, victim, now):
+        return candidate.priority < victim.priority
+
+    def describe(self):
+        return f"priority ({'preemptive' if self.preemptive else 'non-preemptive'})"
+
+
+class RoundRobinPolicy(SchedulingPolicy):
+    """First come, first served with a time slice of ``quantum`` seconds"""
+
+    name = "rr"
+
+    def __init__(self, quantum=2.0):
+        super().__init__(preemptive=False)
+        self.quantum = quantum
+
+    def ready_key(self, process):
+        return (process.ready_since, process.pid)
+
+    def running_key(self, process):
+        return (process.slice_start, process.pid)
+
+    def outranks(self, candidate, victim, now):
+        return False
+
+    def describe(self):
+        return f"round robin (q={self.quantum:g}s)"
+
+
+class SRTFPolicy(SchedulingPolicy):
+    """Shortest remaining time first; a shorter arrival preempts the longest running job.
+
+    A running process's ``remaining`` is only refreshed on engine ticks
+    (never, in a simulation), so ranking uses ``time_left()``, which counts
+    down to its deadline.
+    """
+
+    name = "srtf"
+    dynamic_running = True      # time left shrinks while a process runs
+
+    def ready_key(self, process):
+        return (process.time_left(), process.pid)
+
+    def outranks(self, candidate, victim, now):
+        return candidate.time_left() < victim.time_left()
+
+
+class MLFQPolicy(SchedulingPolicy):
+    """Multi-level feedback queue.
+
+    New processes enter level 0. A process that uses its whole slice
+    (``quantum * 2**level``) drops one level, so interactive, short work
+    stays on top. Every ``boost_interval`` seconds all processes return to
+    level 0 so long jobs can't starve. A ready process on a higher level
+    preempts a running one on a lower level.
+    """
+
+    name = "mlfq"
+
+    def __init__(self, quantum=1.0, levels=3, boost_interval=30.0):
+        super().__init__(preemptive=True)
+        self.quantum = quantum
+        self.levels = levels
+        self.boost_interval = boost_interval
+        self.level = {}             # pid -> level, absent means 0
+        self._last_boost = None
+
+    def ready_key(self, process):
+        return (self.level.get(process.pid, 0), process.ready_since, process.pid)
+
+    def running_key(self, process):
+        return (self.level.get(process.pid, 0), process.slice_start, process.pid)
+
+    def outranks(self, candidate, victim, now):
+        return self.level.get(candidate.pid, 0) < self.level.get(victim.pid, 0)
+
+    def quantum_for(self, process):
+        return self.quantum * 2 ** self.level.get(process.pid, 0)
+
+    def on_expire(self, process):
+        level = self.level.get(process.pid, 0)
+        if level < self.levels - 1:
+            self.level[process.pid] = level + 1
+
+    def maybe_rekey(self, now):
+        if self._last_boost is None:
+            self._last_boost = now
+        if now - self._last_boost < self.boost_interval:
+            return False
+        self._last_boost = now
+        if not self.level:
+            return False
+        self.level.clear()
+        return True
+
+    def forget(self, process):
+        self.level.pop(process.pid, None)
+
+    def describe(self):
+        return f"MLFQ ({self.levels} levels, q={self.quantum:g}s)"
+
+
+class AgingPolicy(SchedulingPolicy):
+    """Priority scheduling where waiting raises priority by one level per ``interval`` seconds.
+
+    The effective priority of a ready process is
+    ``priority - (now - ready_since) / interval``. Every ready process ages
+    at the same rate, so ordering by ``priority + ready_since / interval``
+    is the same order at any ``now`` and the heap keys never go stale. A
+    dispatched process keeps the whole levels it earned until it is
+    preempted, so two aged processes don't keep swapping.
+    """
+
+    name = "aging"
+
+    def __init__(self, interval=5.0, preemptive=True):
+        super().__init__(preemptive)
+        self.interval = interval
+
+    def effective(self, process, now):
+        return math.ceil(process.priority - (now - process.ready_since) / self.interval)
+
+    def ready_key(self, process):
+        return (process.priority + process.ready_since / self.interval, process.pid)
+
+    def running_key(self, process):
+        return (self.effective(process, process.slice_start), process.pid)
+
+    def outranks(self, candidate, victim, now):
+        return self.effective(candidate, now) < self.effective(victim, victim.slice_start)
+
+    def describe(self):
+        return f"aging ({self.interval:g}s per level)"
+
+
+POLICIES = {
+    "priority": PriorityPolicy,
+    "rr": RoundRobinPolicy,
+    "srtf": SRTFPolicy,
+    "mlfq": MLFQPolicy,
+    "aging": AgingPolicy,
+}
+
+
+def make_policy(name, quantum=None, preemptive=False):
+    """Build a policy by name; ``quantum`` applies to rr/mlfq, and to aging as its interval.
+
+    ``preemptive`` applies to priority only: srtf, mlfq and aging always
+    preempt and rr never does (``preemptive_enabled`` can still be toggled
+    on the core afterwards).
+    """
+    if name not in POLICIES:
+        raise ValueError(f"unknown policy {name!r}, expected one of {', '.join(POLICIES)}")
+    if name == "priority":
+        return PriorityPolicy(preemptive)
+    if name in ("rr", "mlfq", "aging") and quantum is not None:
+        return POLICIES[name](quantum)
+    return POLICIES[name]()
@@ -0,0 +1,124 @@
+# # Multiprocess-Alarm-Schedule - frame phase timing and on-demand profiling
+
+import collections
+import cProfile
+import sys
+import threading
+import time
+
+
+class FrameProfiler:
+    """Times the phases of each GUI frame.
+
+    Callers check ``enabled`` before calling ``begin()``/``mark()``, so a
+    disabled profiler costs one attribute test per phase. ``mark(name)``
+    charges the time since the previous mark to ``name``; the last
+    ``window`` frames are kept per phase for the mean and max.
+    """
+
+    def __init__(self, window=120):
+        self.enabled = False
+        self.window = window
+        self.phases = collections.OrderedDict()    # name -> deque of seconds
+        self.frames = collections.deque(maxlen=window)
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    def begin(self):
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, name):
+        now = time.perf_counter()
+        samples = self.phases.get(name)
+        if samples is None:
+            samples = self.phases[name] = collections.deque(maxlen=self.window)
+        samples.append(now - self._last)
+        self._last = now
+
+    def end(self):
+        self.frames.append(time.perf_counter() - self._frame_start)
+
+    def reset(self):
+        self.phases.clear()
+        self.frames.clear()
+
+    def summary(self):
+        """[(name, last, mean, max)] in milliseconds, the whole frame last"""
+        rows = [(name, samples) for name, samples in self.phases.items()]
+        rows.append(("frame", self.frames))
+        return [(name, samples[-1] * 1e3, sum(samples) / len(samples) * 1e3, max(samples) * 1e3)
+                for name, samples in rows if samples]
+
+    def format(self):
+        lines = [f"{'phase':<10} {'last':>7} {'mean':>7} {'max':>7}  (ms)"]
+        lines += [f"{name:<10} {last:>7.2f} {mean:>7.2f} {worst:>7.2f}"
+                  for name, last, mean, worst in self.summary()]
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread every ``interval`` seconds.
+
+    Unlike cProfile it adds no cost to the profiled code itself. ``save()``
+    writes folded stacks ("outer;inner count" per line), the input format
+    of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.interval = interval
+        self.samples = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def enable(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Capture:
+    """An on-demand profiling session written to ``path`` when stopped.
+
+    ``kind`` is ``"cprofile"`` (deterministic, pstats file readable with
+    ``python -m pstats``) or ``"sampling"`` (folded stacks).
+    """
+
+    def __init__(self, path, kind="cprofile"):
+        if kind not in ("cprofile", "sampling"):
+            raise ValueError(f"unknown profiler kind {kind!r}")
+        self.path = path
+        self.kind = kind
+        self.profiler = cProfile.Profile() if kind == "cprofile" else SamplingProfiler()
+        self.started = time.monotonic()
+        self.profiler.enable()
+
+    def stop(self):
+        """Stop profiling, write the file and return its path"""
+        self.profiler.disable()
+        if self.kind == "cprofile":
+            self.profiler.dump_stats(self.path)
+        else:
+            self.profiler.save(self.path)
+        return self.path
@@ -0,0 +1,183 @@
+# # Multiprocess-Alarm-Schedule - cron and interval recurrence engine
+
+import bisect
+import datetime
+import functools
+import math
+import re
+
+MONTH_NAMES = {name: i for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+WEEKDAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# A date that matches the day and month fields but no real day (e.g. 30 2) is
+# given up on after this many days
+MAX_SEARCH_DAYS = 366 * 8
+
+
+def _parse_field(text, low, high, names=None):
+    """Expand one cron field (``*``, ``a``, ``a-b``, any of them ``/step``, comma lists) to a sorted list"""
+    values = set()
+    for item in text.lower().split(","):
+        item, _, step = item.partition("/")
+        step = int(step) if step else 1
+        if item == "*":
+            start, end = low, high
+        else:
+            first, _, last = item.partition("-")
+            start = names[first] if names and first in names else int(first)
+            if last:
+                end = names[last] if names and last in names else int(last)
+            else:
+                end = high if step > 1 else start     # "a/step" runs from a to the end of the range
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"cron field {text!r} is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields are expanded to sorted lists once, when the expression is
+    compiled, so ``next_after()`` only bisects them while walking forward
+    month, day, hour and minute. As in cron, when both day fields are
+    restricted a day matching either one fires. Times are local. Recent
+    answers are memoised per minute, so many alarms sharing an expression
+    are re-armed with one calculation.
+    """
+
+    memo_size = 1024
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"invalid cron expression {expression!r}, expected 5 fields")
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12, MONTH_NAMES)
+        self.weekdays = {day % 7 for day in _parse_field(fields[4], 0, 7, WEEKDAY_NAMES)}  # 7 is Sunday too
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+        self._memo = {}
+
+    def _day_matches(self, day):
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, t, anchor=None):
+        """First fire time strictly after Unix time ``t``, or None if there is none"""
+        # Fire times are whole minutes, so every t in one minute has the same answer
+        minute = math.floor(t / 60)
+        if minute not in self._memo:
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[minute] = self._search(minute + 1)
+        return self._memo[minute]
+
+    def _search(self, minute):
+        """First matching time at or after the start of Unix minute ``minute``"""
+        start = datetime.datetime.fromtimestamp(minute * 60)
+        day, hour, minute = start.date(), start.hour, start.minute
+        for _ in range(MAX_SEARCH_DAYS):
+            if day.month in self.months and self._day_matches(day):
+                i = bisect.bisect_left(self.hours, hour)
+                if i < len(self.hours):
+                    j = bisect.bisect_left(self.minutes, minute if self.hours[i] == hour else 0)
+                    if j < len(self.minutes):
+                        return self._at(day, self.hours[i], self.minutes[j])
+                    if i + 1 < len(self.hours):
+                        return self._at(day, self.hours[i + 1], self.minutes[0])
+            day += datetime.timedelta(days=1)
+            hour = minute = 0
+        return None
+
+    @staticmethod
+    def _at(day, hour, minute):
+        return datetime.datetime.combine(day, datetime.time(hour, minute)).timestamp()
+
+    def describe(self):
+        return self.expression
+
+
+class IntervalSchedule:
+    """Every ``seconds`` seconds, on a grid starting at the recurrence's first fire time"""
+
+    def __init__(self, expression, seconds):
+        if seconds <= 0:
+            raise ValueError(f"invalid interval {expression!r}, must be positive")
+        self.expression = expression
+        self.seconds = seconds
+
+    def next_after(self, t, anchor=None):
+        if anchor is None or anchor > t:
+            return t + self.seconds if anchor is None else anchor
+        return anchor + (math.floor((t - anchor) / self.seconds) + 1) * self.seconds
+
+    def describe(self):
+        return self.expression
+
+
+_INTERVAL = re.compile(r"(\d+(?:\.\d+)?)([smhd])")
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_schedule(expression):
+    """Compile a schedule once per distinct expression.
+
+    ``@every 5m`` (units s, m, h, d, combinable as ``1h30m``) is an
+    interval; anything else is a cron expression or one of its macros
+    (``@hourly``, ``@daily``, ...). Alarms sharing an expression share the
+    compiled object, so arming 100k of them parses each expression once.
+    """
+    text = expression.strip()
+    if text.lower().startswith("@every"):
+        spec = text[len("@every"):].strip().lower()
+        parts = _INTERVAL.findall(spec)
+        if not parts or "".join(value + unit for value, unit in parts) != spec.replace(" ", ""):
+            raise ValueError(f"invalid interval {expression!r}, expected e.g. '@every 5m' or '@every 1h30m'")
+        return IntervalSchedule(text, sum(float(value) * UNITS[unit] for value, unit in parts))
+    return CronSchedule(text)
+
+
+class Recurrence:
+    """A recurring alarm definition: what to run and when it repeats.
+
+    ``anchor`` is the first fire time, the grid an interval schedule keeps
+    to; ``runs`` counts the occurrences fired so far.
+    """
+
+    __slots__ = ("id", "name", "seconds", "priority", "schedule", "anchor", "runs")
+
+    def __init__(self, id, name, seconds, priority, expression, anchor=None, runs=0):
+        self.id = id
+        self.name = name
+        self.seconds = seconds
+        self.priority = priority
+        self.schedule = compile_schedule(expression)
+        self.anchor = anchor
+        self.runs = runs
+
+    @property
+    def expression(self):
+        return self.schedule.expression
+
+    def next_after(self, t):
+        return self.schedule.next_after(t, self.anchor)
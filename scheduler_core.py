@@ -0,0 +1,1499 @@
+# # Multiprocess-Alarm-Schedule - scheduling core (no Tk dependency)
+
+import argparse
+import collections
+import contextlib
+import datetime
+import gc
+import math
+import os
+import time
+import threading
+import heapq
+import queue as thread_queue
+
+from bulk_import import import_alarms
+from notifications import CallbackSink, build_notifier, is_local_url
+from intervals import IntervalStore
+from metrics import DURATION_BUCKETS, REFILL_BUCKETS, MetricsRegistry
+from policies import PriorityPolicy, make_policy, POLICIES
+from recurrence import compile_schedule
+from timers import AlarmStore, AlarmTimers, parse_when
+
+class TickEngine:
+    """Single driver thread that advances the countdown of every running process.
+
+    Running processes sit in a heap keyed by their next wake-up on the
+    monotonic ``clock``, so thousands of alarms share one thread instead of
+    parking one thread each. A process wakes every ``tick`` seconds of run
+    time to report progress and once more exactly at its completion
+    deadline. Pausing or stopping a process only invalidates its heap entry
+    (lazy deletion); stale entries are skipped when popped and compacted
+    away when they start to dominate the heap. Messages a process posts
+    while being ticked are held and put on its queue once ``_cond`` is
+    released, so a slow queue ``wakeup`` can't stall the countdowns or a
+    ``schedule()`` waiting to arm or disarm.
+    """
+
+    def __init__(self, tick=1.0, clock=time.monotonic, wall=time.time):
+        self.tick = tick
+        self.clock = clock
+        self.wall = wall            # timestamps shown to users (Gantt, start/end times)
+        self._heap = []             # (wake time, seq, token, process)
+        self._seq = 0
+        self._armed = 0             # processes with a live heap entry
+        self._cond = threading.Condition()
+        self._thread = None
+        self._outbox = None         # (queue, message) posted during the current batch of ticks
+
+    def arm(self, process, when):
+        """Wake a process at clock time ``when``"""
+        with self._cond:
+            if not process._armed:
+                self._armed += 1
+            process._armed = True
+            process._token += 1
+            heapq.heappush(self._heap, (when, self._seq, process._token, process))
+            self._seq += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="TickEngine", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def disarm(self, process):
+        """Drop the pending wake-up of a process without touching the heap"""
+        with self._cond:
+            if process._armed:
+                self._armed -= 1
+                process._armed = False
+                process._suspend(self.clock())
+            process._token += 1
+            if len(self._heap) > 64 and len(self._heap) > 4 * self._armed:
+                self._compact()
+
+    def _fail(self, process, error):
+        process.failure = f"countdown error: {error!r}"
+        try:
+            process._finish()
+        except Exception:
+            process.is_running = False
+
+    def post(self, queue, item):
+        """Put a message from a process, deferring it while the driver thread holds the lock"""
+        if self._outbox is not None and threading.current_thread() is self._thread:
+            self._outbox.append((queue, item))
+        else:
+            queue.put(item)
+
+    def _compact(self):
+        self._heap = [e for e in self._heap if e[2] == e[3]._token]
+        heapq.heapify(self._heap)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._outbox = []
+                self._tick_due()
+                outbox, self._outbox = self._outbox, None
+            for queue, item in outbox:
+                queue.put(item)
+
+    def _tick_due(self):
+        """Tick due processes until there is nothing due and something to post"""
+        while True:
+            if not self._heap:
+                if self._outbox:
+                    return
+                self._cond.wait()
+                continue
+
+            when, _, token, process = self._heap[0]
+            if token != process._token:
+                heapq.heappop(self._heap)  # Paused or stopped since armed
+                continue
+
+            delay = when - self.clock()
+            if delay > 0:
+                if self._outbox:
+                    return
+                self._cond.wait(delay)
+                continue
+
+            heapq.heappop(self._heap)
+            # The process computes its next wake-up from the scheduled
+            # time, not from now, so wake-up latency never accumulates
+            try:
+                next_when = process._tick(when)
+            except Exception as e:
+                # One broken countdown must not take every other one down with the thread
+                next_when = None
+                self._fail(process, e)
+            if next_when is None:
+                self._armed -= 1
+                process._armed = False
+            else:
+                heapq.heappush(self._heap, (next_when, self._seq, token, process))
+                self._seq += 1
+            if len(self._outbox) >= 1024:
+                return              # A long burst of due ticks still delivers as it goes
+
+
+_default_engine = None
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """Suspend the cyclic GC while allocating many long-lived objects at once"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def default_engine():
+    """Return the shared TickEngine used by processes created without one"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = TickEngine()
+    return _default_engine
+
+
+class ManagedProcess:
+    """A countdown alarm of ``sleep_time`` seconds (float, millisecond precision).
+
+    While running, the alarm has a completion deadline on the engine clock;
+    pausing stores the exact time left, so pause/resume neither loses nor
+    gains time. ``drift`` is how late the completion fired compared to
+    that deadline.
+
+    ``status`` is owned by the SchedulerCore managing the process (see
+    ``SchedulerCore.set_status``); the process itself only sets
+    ``finished`` when its countdown ends.
+    """
+
+    persistent = True  # Whether the journal can restore it after a restart
+
+    def __init__(self, pid, name, sleep_time, priority, queue, engine=None):
+        self.pid = pid
+        self.name = name
+        self.sleep_time = sleep_time
+        self.priority = priority
+        self.queue = queue
+        self.status = "Waiting"
+        self.start_time = None
+        self.end_time = None
+        self.progress = 0
+        self.remaining = sleep_time
+        self.drift = None
+        self.finished = False
+        self.submitted_at = None    # engine clock times; all but completed_at set by the SchedulerCore
+        self.first_run_at = None
+        self.completed_at = None
+        self.ready_since = None     # entered the waiting/paused queue
+        self.slice_start = None     # last dispatched
+        self.cpu_time = 0.0         # engine seconds spent running
+        self.context_switches = 0   # times paused by the scheduler while running
+        self.fire_at = None         # wall time an absolute-time alarm fires, its countdown's end (see timers.py)
+        self.recurrence = None      # Recurrence this process is an occurrence of
+        self.occurrence = 0         # which occurrence, counting from 1
+        self.failure = None         # why a job failed, e.g. "exit code 1"; None if it succeeded
+        self.engine = engine or default_engine()
+        self.is_running = False
+        self.is_paused = False
+        self._deadline = None
+        self._token = 0
+        self._armed = False
+
+    def _arm(self):
+        now = self.engine.clock()
+        self._deadline = now + self.remaining
+        self.engine.arm(self, min(now + self.engine.tick, self._deadline))
+
+    def time_left(self):
+        """Seconds of countdown left now; ``remaining`` is only refreshed on engine ticks"""
+        if self._armed:
+            return max(0.0, self._deadline - self.engine.clock())
+        return self.remaining
+
+    def _suspend(self, now):
+        """Called by the engine on disarm: keep the exact time left"""
+        self.remaining = max(0.0, self._deadline - now)
+
+    def _tick(self, when):
+        """Advance the countdown to ``when``; return the next wake-up or None once finished"""
+        if not self.is_running:
+            return None
+        self.remaining = max(0.0, self._deadline - when)
+        self.progress = int(100 * (self.sleep_time - self.remaining) / self.sleep_time)
+        self.engine.post(self.queue, ("update", self.pid, self.progress))
+        if self.remaining <= 0:
+            self.drift = self.engine.clock() - self._deadline
+            self._finish()
+            return None
+        return min(when + self.engine.tick, self._deadline)
+
+    def _wall_clock_text(self):
+        return datetime.datetime.fromtimestamp(self.engine.wall()).strftime("%H:%M:%S")
+
+    def _finish(self):
+        self.end_time = self._wall_clock_text()
+        self.completed_at = self.engine.clock()
+        self.finished = True
+        self.is_running = False
+        self.engine.post(self.queue, ("completed", self.pid))
+        self.engine.post(self.queue, ("gantt_end", self.pid, self.engine.wall()))
+
+    def start(self):
+        if self.is_running or self.finished:
+            return
+        self.start_time = self._wall_clock_text()
+        self.queue.put(("gantt_start", self.pid, self.engine.wall()))
+        self.is_running = True
+        if self.remaining <= 0:
+            self._finish()
+        elif not self.is_paused:
+            self._arm()
+
+    def pause(self):
+        self.is_paused = True
+        self.engine.disarm(self)
+
+    def resume(self):
+        self.is_paused = False
+        if not self.is_running:
+            self.start()  # Never started (e.g. parked by preemption while waiting)
+        elif not self._armed:
+            self._arm()
+
+    def stop(self):
+        self.is_running = False
+        self.engine.disarm(self)
+
+
+def priority_key(process):
+    return (process.priority, process.pid)
+
+
+class RunQueue:
+    """Indexed binary heap of processes ordered by ``key(process)``.
+
+    The key is a tuple of numbers, (priority, pid) by default. Each
+    process's heap position is tracked, so membership tests are O(1)
+    and push, pop, remove and in-place key changes (decrease/increase key)
+    are O(log n). With ``worst_first`` the order is reversed, which is how
+    the running set keeps its best preemption victim on top.
+    """
+
+    def __init__(self, key=priority_key, worst_first=False):
+        self._heap = []     # [key, process]
+        self._pos = {}      # pid -> index in _heap
+        self.key = key
+        self.worst_first = worst_first
+
+    def _key(self, process):
+        if self.worst_first:
+            return tuple(-x for x in self.key(process))
+        return self.key(process)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, process):
+        return process.pid in self._pos
+
+    def __iter__(self):
+        return (entry[1] for entry in list(self._heap))
+
+    def peek(self):
+        return self._heap[0][1] if self._heap else None
+
+    def push(self, process):
+        self._heap.append([self._key(process), process])
+        self._pos[process.pid] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def extend(self, processes):
+        """Add many processes at once.
+
+        A large batch is merged by sorting (a sorted list is a valid heap),
+        a small one relative to the heap is pushed one by one; rebuilding
+        only when the heap grows by a constant factor keeps repeated
+        chunked loads linear overall.
+        """
+        entries = [[self._key(process), process] for process in processes]
+        if len(entries) * 8 < len(self._heap):
+            for entry in entries:
+                self._heap.append(entry)
+                self._pos[entry[1].pid] = len(self._heap) - 1
+                self._sift_up(len(self._heap) - 1)
+            return
+        self._heap.extend(entries)
+        self._heap.sort(key=lambda entry: entry[0])
+        self._pos = {entry[1].pid: i for i, entry in enumerate(self._heap)}
+
+    def rekey(self, key=None):
+        """Switch to a new key function (or recompute the current one) and rebuild"""
+        if key is not None:
+            self.key = key
+        for entry in self._heap:
+            entry[0] = self._key(entry[1])
+        self._heap.sort(key=lambda entry: entry[0])
+        self._pos = {entry[1].pid: i for i, entry in enumerate(self._heap)}
+
+    def pop(self):
+        process = self._heap[0][1]
+        self.remove(process)
+        return process
+
+    def remove(self, process):
+        i = self._pos.pop(process.pid)
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last[1].pid] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[1].pid])
+
+    def update(self, process):
+        """Restore heap order after the process priority changed"""
+        i = self._pos[process.pid]
+        self._heap[i][0] = self._key(process)
+        self._sift_up(i)
+        self._sift_down(self._pos[process.pid])
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i][1].pid] = i
+        self._pos[heap[j][1].pid] = j
+
+    def _sift_up(self, i):
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) // 2
+            if heap[i][0] >= heap[parent][0]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        heap = self._heap
+        n = len(heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and heap[child][0] < heap[smallest][0]:
+                    smallest = child
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+
+class EventQueue(thread_queue.Queue):
+    """Thread-safe message queue that remembers when each message was put.
+
+    Messages keep their plain tuple form; the enqueue time is stored next to
+    them so the consumer can measure event lag. If ``wakeup`` is set, it is
+    called on the producer's thread after every message whose kind is in
+    ``wake_kinds``, so a front end can react to a completion at once
+    instead of finding it at its next poll. It must be cheap and thread safe.
+    """
+
+    wake_kinds = frozenset({"completed"})
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self.last_stamp = None      # enqueue time of the last message taken
+        self.wakeup = None
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        wakeup = self.wakeup
+        if wakeup is not None and item[0] in self.wake_kinds:
+            wakeup()
+
+    def _put(self, item):
+        self.queue.append((time.monotonic(), item))
+
+    def _get(self):
+        self.last_stamp, item = self.queue.popleft()
+        return item
+
+    def oldest_age(self):
+        """Seconds the oldest pending message has been waiting"""
+        with self.mutex:
+            return time.monotonic() - self.queue[0][0] if self.queue else 0.0
+
+
+class ProcessRegistry:
+    """Processes keyed by pid, iterated in the order they were added.
+
+    Lookup and removal by pid are O(1), so event handling no longer scans
+    every process to find the one a message is about.
+    """
+
+    def __init__(self):
+        self._by_pid = {}
+
+    def add(self, process):
+        self._by_pid[process.pid] = process
+
+    def get(self, pid):
+        return self._by_pid.get(pid)
+
+    def remove(self, pid):
+        return self._by_pid.pop(pid, None)
+
+    def __contains__(self, pid):
+        return pid in self._by_pid
+
+    def __len__(self):
+        return len(self._by_pid)
+
+    def __iter__(self):
+        return iter(self._by_pid.values())
+
+
+STATUSES = ("Waiting", "Running", "Paused", "Completed", "Failed")
+FINISHED = ("Completed", "Failed")
+
+# Allowed status changes; None is "not registered with the core"
+TRANSITIONS = {
+    None: {"Waiting", "Paused", "Completed", "Failed"},
+    "Waiting": {"Running", "Completed"},
+    "Running": {"Paused", "Completed", "Failed"},
+    "Paused": {"Running", "Completed", "Failed"},
+    "Completed": set(),
+    "Failed": set(),
+}
+
+
+class SchedulerCore:
+    """Owns the processes, the scheduling policy and the event queue.
+
+    The core knows nothing about Tk: front ends subscribe with a listener
+    callable ``listener(kind, message)`` where ``kind`` is ``"log"`` or
+    ``"notify"``, and drive the core by calling ``schedule()`` and
+    ``process_events()``.
+
+    Which ready process runs next is decided by a pluggable
+    ``SchedulingPolicy`` (see policies.py), switchable with
+    ``set_policy()``. Alarms set for an absolute time wait in ``timers``
+    (see timers.py) and join ``processes`` only when due. Every status
+    change goes through ``set_status()``, which keeps the pids of each
+    status in ``by_status`` so ``count(status)`` is O(1). With
+    ``check_consistency`` every change is followed by ``verify()``, an O(n)
+    recount meant for tests.
+    """
+
+    def __init__(self, max_running=None, preemptive=False, engine=None, backend=None, journal=None,
+                 log_file=None, check_consistency=False, policy=None, timers=None):
+        self.processes = ProcessRegistry()
+        self.waiting = RunQueue()
+        self.paused = RunQueue()
+        self.running = RunQueue(worst_first=True)
+        self.pid_counter = 1
+        self.max_running = max_running or os.cpu_count() or 1
+        self.queue = EventQueue()
+        self.queue_depth = 0        # messages left after the last drain
+        self.event_lag = 0.0        # age of the oldest message in the last drain
+        self.events_coalesced = 0
+        self._changed = set()       # pids whose displayed state changed
+        self.gantt_data = {}
+        self.intervals = IntervalStore()
+        self.by_status = {status: set() for status in STATUSES}
+        self.check_consistency = check_consistency
+        self.engine = engine or default_engine()
+        self.backend = backend
+        self.journal = journal
+        self.log_file = log_file
+        self.timers = timers        # absolute-time alarms not yet due, created on first use
+        self.listeners = []
+        self.exporters = []         # metrics server / snapshot writer, closed with the core
+        self.last_pass_seconds = 0.0
+        self._freed = collections.deque()   # engine times of completions whose slot is not refilled yet
+        self._rearm = []            # (recurrence, after) whose next occurrence is still to be armed
+        self._occurrences = {}      # recurrence id -> pid of its latest occurrence
+        self.retired = dict.fromkeys(FINISHED, 0)   # finished occurrences removed by retire_occurrence()
+        self._init_metrics()
+        self.policy = None
+        self.set_policy(policy or PriorityPolicy(preemptive))
+        if timers is not None:
+            timers.rearm_unarmed(self.engine.wall())
+
+    def _init_metrics(self):
+        """Register the core's metrics; most are read from existing state only when collected"""
+        m = self.metrics = MetricsRegistry()
+        m.gauge("scheduler_queue_depth", "Messages waiting in the event queue", self.queue.qsize)
+        m.gauge("scheduler_event_lag_seconds", "Age of the oldest message at the last drain",
+                lambda: self.event_lag)
+        m.gauge("scheduler_processes", "Processes by status",
+                lambda: {status: len(pids) for status, pids in self.by_status.items()}, label="status")
+        m.gauge("scheduler_max_running", "Concurrency limit", lambda: self.max_running)
+        m.gauge("scheduler_alarms_pending", "Absolute-time alarms registered but not yet due",
+                lambda: len(self.timers) if self.timers is not None else 0)
+        m.gauge("scheduler_alarms_paged_in", "Pending alarms held in the in-memory timer heap",
+                lambda: self.timers.paged_in if self.timers is not None else 0)
+        m.counter("scheduler_events_coalesced_total", "Progress messages superseded before being applied",
+                  lambda: self.events_coalesced)
+        self.events_handled = m.counter("scheduler_events_total", "Event queue messages handled")
+        self.starts = m.counter("scheduler_starts_total", "Processes started for the first time")
+        self.pauses = m.counter("scheduler_pauses_total", "Running processes paused (preempted)")
+        self.resumes = m.counter("scheduler_resumes_total", "Paused processes resumed")
+        self.failures = m.counter("scheduler_failures_total", "Jobs whose child process exited with an error")
+        self.pass_latency = m.histogram("scheduler_pass_seconds", "Duration of one schedule() pass")
+        self.response_time = m.histogram("scheduler_response_seconds", "Time from submission to first run",
+                                         DURATION_BUCKETS)
+        self.wait_time = m.histogram("scheduler_wait_seconds",
+                                     "Time a completed process spent ready but not running",
+                                     DURATION_BUCKETS)
+        self.turnaround_time = m.histogram("scheduler_turnaround_seconds",
+                                           "Time from submission to completion", DURATION_BUCKETS)
+        self.refill_latency = m.histogram("scheduler_refill_seconds",
+                                          "Time from a completion freeing a slot to the next start",
+                                          REFILL_BUCKETS)
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def log(self, msg):
+        if self.log_file is not None:
+            self.log_file.write(msg)
+        for listener in self.listeners:
+            listener("log", msg)
+
+    def notify(self, message):
+        for listener in self.listeners:
+            listener("notify", message)
+
+    @property
+    def preemptive_enabled(self):
+        return self.policy.preemptive
+
+    @preemptive_enabled.setter
+    def preemptive_enabled(self, value):
+        self.policy.preemptive = bool(value)
+
+    def set_policy(self, policy):
+        """Switch the scheduling policy; queues are re-ordered in O(n log n)"""
+        policy.started_at = self.engine.clock()
+        previous, self.policy = self.policy, policy
+        self.waiting.rekey(policy.ready_key)
+        self.paused.rekey(policy.ready_key)
+        self.running.rekey(policy.running_key)
+        if previous is not None:
+            self.log(f"📐 Scheduling policy set to {policy.describe()}")
+
+    def policy_report(self):
+        return self.policy.report(self.engine.clock())
+
+    def close(self):
+        """Stop the metrics exporters, then flush the journal and the log file"""
+        for exporter in self.exporters:
+            exporter.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.log_file is not None:
+            self.log_file.close()
+        if self.timers is not None:
+            self.timers.close()
+
+    @property
+    def process_list(self):
+        """Snapshot of all processes in insertion order (O(n) copy)"""
+        return list(self.processes)
+
+    def find_process(self, pid):
+        return self.processes.get(pid)
+
+    def take_changed(self):
+        """Return the pids changed since the last call and start a new set"""
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def count(self, status):
+        return len(self.by_status[status])
+
+    def total(self, status):
+        """Like count(), but also counting the retired occurrences of recurring alarms"""
+        return len(self.by_status[status]) + self.retired.get(status, 0)
+
+    def set_status(self, p, status):
+        """Move a process to ``status`` (None to unregister it).
+
+        This is the only place a managed process changes status; it checks
+        the transition and keeps ``by_status`` and ``_changed`` in step.
+        """
+        old = p.status if p.pid in self.by_status[p.status] else None
+        if status == old:
+            return
+        if status is not None and status not in TRANSITIONS[old]:
+            raise ValueError(f"Process {p.pid}: invalid status change {old} -> {status}")
+        if old is not None:
+            self.by_status[old].discard(p.pid)
+        if status is not None:
+            self.by_status[status].add(p.pid)
+            p.status = status
+        self._changed.add(p.pid)
+        if self.check_consistency:
+            self.verify()
+
+    def verify(self):
+        """Recount every status from scratch; raise AssertionError on any mismatch"""
+        recount = {status: set() for status in STATUSES}
+        for p in self.processes:
+            recount[p.status].add(p.pid)
+        assert recount == self.by_status, "status membership out of step with processes"
+        for status, run_queue in (("Waiting", self.waiting), ("Paused", self.paused)):
+            assert {p.pid for p in run_queue} == self.by_status[status], f"{status} queue out of step"
+        # Running holds the Running set, minus ones whose completion is still queued
+        assert {p.pid for p in self.running} <= self.by_status["Running"], "running queue out of step"
+
+    @contextlib.contextmanager
+    def _bulk(self):
+        """Pause the GC and defer consistency checks until a bulk change is complete"""
+        check, self.check_consistency = self.check_consistency, False
+        try:
+            with gc_paused():
+                yield
+        finally:
+            self.check_consistency = check
+        if check:
+            self.verify()
+
+    def _journal_status(self, p):
+        if self.journal is not None and p.persistent:
+            self.journal.record("status", p.pid, p.status, p.remaining, p.progress,
+                                p.start_time, p.end_time)
+
+    def restore(self, pid_counter, rows):
+        """Rebuild processes from journal rows without logging each one.
+
+        Processes that were running when the journal was written come back
+        Paused with their remaining time, so schedule() resumes them.
+        """
+        with self._bulk():
+            self._restore_rows(rows)
+        self.pid_counter = max(self.pid_counter, pid_counter)
+        if rows:
+            self.log(f"♻️ Restored {len(rows)} processes from the journal")
+
+    def _restore_rows(self, rows):
+        waiting, paused = [], []
+        add = self.processes.add
+        now = self.engine.clock()
+        for pid, name, sleep_time, priority, status, remaining, progress, start_time, end_time in rows:
+            p = ManagedProcess(pid, name, sleep_time, priority, self.queue, self.engine)
+            p.remaining, p.progress = remaining, progress
+            p.start_time, p.end_time = start_time, end_time
+            p.submitted_at = p.ready_since = now
+            if status == "Waiting":
+                waiting.append(p)
+            elif status in FINISHED:
+                p.finished = True
+                if status == "Failed":
+                    p.failure = "failed before the restart"
+            else:
+                status = "Paused"
+                p.is_paused = True
+                paused.append(p)
+            add(p)
+            self.set_status(p, status)
+        self.waiting.extend(waiting)
+        self.paused.extend(paused)
+
+    def remove_process(self, pid):
+        """Forget a process, stopping it first if it hasn't finished"""
+        p = self.processes.remove(pid)
+        if p is None:
+            return None
+        for run_queue in (self.waiting, self.paused, self.running):
+            if p in run_queue:
+                run_queue.remove(p)
+        if not p.finished:
+            p.stop()
+        if p.recurrence is not None and p.status not in FINISHED:
+            self._rearm.append((p.recurrence, self.engine.wall()))
+        self.intervals.close(pid, self.engine.wall())
+        self.policy.forget(p)
+        self.set_status(p, None)
+        if self.journal is not None and p.persistent:
+            self.journal.record("remove", pid)
+        return p
+
+    def add_process(self, name, sleep_time, priority):
+        """Register a new process; the caller decides when to schedule"""
+        proc = ManagedProcess(self.pid_counter, name, sleep_time, priority, self.queue, self.engine)
+        return self._register(proc)
+
+    def add_alarm_at(self, name, fire_at, sleep_time, priority):
+        """Register an alarm that fires at ``fire_at`` (Unix time or datetime).
+
+        It is submitted ``sleep_time`` seconds earlier so its countdown ends
+        at ``fire_at``. Until then the alarm lives in ``timers`` only, not in
+        ``processes``; ``process_events()`` submits it when it is due.
+        """
+        if isinstance(fire_at, datetime.datetime):
+            fire_at = fire_at.timestamp()
+        self._alarm_timers().add(name, fire_at, sleep_time, priority)
+        when = datetime.datetime.fromtimestamp(fire_at).strftime("%Y-%m-%d %H:%M:%S")
+        self.log(f"⏰ Alarm {name} set for {when}")
+
+    def add_alarms_at(self, alarms):
+        """Register many (fire_at, name, sleep_time, priority) alarms without logging each one"""
+        self._alarm_timers().add_many(alarms)
+
+    def add_recurring(self, name, schedule, sleep_time, priority, start=None):
+        """Register an alarm that repeats on ``schedule``; return its Recurrence.
+
+        ``schedule`` is a cron expression or ``@every 5m`` (see
+        recurrence.py); ``start`` (Unix time or datetime) overrides the
+        first fire time. Each occurrence joins ``processes`` when due and
+        the next one is armed when it completes, so runs never overlap.
+        Raises ValueError for a schedule that is invalid or never fires.
+        """
+        if isinstance(start, datetime.datetime):
+            start = start.timestamp()
+        recurrence, = self.add_recurring_many([(name, sleep_time, priority, schedule, start)])
+        when = datetime.datetime.fromtimestamp(recurrence.anchor).strftime("%Y-%m-%d %H:%M:%S")
+        self.log(f"🔁 Recurring alarm {name} ({schedule}) first at {when}")
+        return recurrence
+
+    def add_recurring_many(self, definitions):
+        """Register many (name, sleep_time, priority, schedule, start) recurrences without logging each one"""
+        return self._alarm_timers().add_recurring(definitions, self.engine.wall())
+
+    def cancel_recurring(self, recurrence_id):
+        """Stop a recurrence; an occurrence already submitted still runs. Return False if unknown"""
+        if self.timers is None or not self.timers.cancel_recurring(recurrence_id):
+            return False
+        self.log(f"⏹️ Recurring alarm {recurrence_id} cancelled")
+        return True
+
+    def _alarm_timers(self):
+        if self.timers is None:
+            self.timers = AlarmTimers()
+        return self.timers
+
+    def release_due_alarms(self):
+        """Submit the absolute-time alarms that are due as processes; return how many"""
+        if not self.timers:
+            return 0
+        # Due times round-trip through the engine clock, so allow for float rounding
+        due = self.timers.pop_due(self.engine.wall() + 1e-6)
+        if not due:
+            return 0
+        procs = self.add_processes([(name, seconds, priority) for _, _, name, seconds, priority, _ in due])
+        recurrences = self.timers.recurrences
+        for proc, row in zip(procs, due):
+            proc.fire_at = row[0] + row[3]
+            if row[5] is not None:
+                proc.recurrence = recurrences[row[5]]
+                proc.occurrence = proc.recurrence.runs
+                previous = self._occurrences.get(row[5])
+                self._occurrences[row[5]] = proc.pid
+                if previous is not None:
+                    self.retire_occurrence(previous)
+        if len(due) == 1:
+            self.log(f"⏰ Alarm {procs[0].name} is due (pid {procs[0].pid})")
+        else:
+            self.log(f"⏰ {len(due)} alarms are due")
+        return len(due)
+
+    def retire_occurrence(self, pid):
+        """Remove a finished occurrence once the next one of its recurrence is submitted.
+
+        A recurrence keeps a single row in ``processes``: its latest
+        occurrence. Earlier runs stay in ``intervals`` and in ``retired``.
+        """
+        p = self.find_process(pid)
+        if p is None or p.status not in FINISHED:
+            return
+        self.retired[p.status] += 1
+        self.remove_process(pid)
+        self.gantt_data.pop(pid, None)
+
+    def add_job(self, name, target, priority, args=(), expected_time=10):
+        """Register a job run for real by the execution backend (see backends.py)"""
+        if self.backend is None:
+            raise RuntimeError("SchedulerCore has no execution backend")
+        proc = self.backend.create_job(self.pid_counter, name, target, priority, self.queue,
+                                       args=args, expected_time=expected_time)
+        return self._register(proc)
+
+    def add_processes(self, specs):
+        """Register many (name, sleep_time, priority) alarms without logging each one"""
+        with self._bulk():
+            return self._add_processes(specs)
+
+    def _add_processes(self, specs):
+        procs = [ManagedProcess(self.pid_counter + i, name, sleep_time, priority, self.queue, self.engine)
+                 for i, (name, sleep_time, priority) in enumerate(specs)]
+        self.pid_counter += len(procs)
+        now = self.engine.clock()
+        for proc in procs:
+            proc.submitted_at = proc.ready_since = now
+            self.processes.add(proc)
+            self.set_status(proc, "Waiting")
+            if self.journal is not None:
+                self.journal.record("add", proc.pid, proc.name, proc.sleep_time, proc.priority)
+        self.waiting.extend(procs)
+        return procs
+
+    def _register(self, proc):
+        proc.submitted_at = proc.ready_since = self.engine.clock()
+        self.processes.add(proc)
+        self.waiting.push(proc)
+        self.set_status(proc, "Waiting")
+        if self.journal is not None and proc.persistent:
+            self.journal.record("add", proc.pid, proc.name, proc.sleep_time, proc.priority)
+        self.log(f"✅ Process {proc.pid} ({proc.name}) added with priority {proc.priority}")
+        self.notify(f"🎉 Process {proc.pid} added successfully!")
+        self.pid_counter += 1
+        return proc
+
+    def change_priority(self, pid, new_priority):
+        """Change a process priority; return False if the pid is unknown"""
+        p = self.find_process(pid)
+        if p is None:
+            return False
+        old_priority = p.priority
+        p.priority = new_priority
+        self._changed.add(pid)
+        if self.journal is not None and p.persistent:
+            self.journal.record("priority", pid, new_priority)
+        for run_queue in (self.waiting, self.paused, self.running):
+            if p in run_queue:
+                run_queue.update(p)
+        self.log(f"🔄 Process {pid} priority changed from {old_priority} to {new_priority}")
+        self.notify(f"✅ Priority of Process {pid} updated!")
+        return True
+
+    def set_max_running(self, max_running):
+        """Change the concurrency limit and reschedule right away"""
+        max_running = max(1, int(max_running))
+        if max_running == self.max_running:
+            return
+        self.max_running = max_running
+        self.log(f"⚙️ Max running processes set to {max_running}")
+        self.schedule()
+
+    @property
+    def context_switches(self):
+        """Running processes paused by the scheduler, the sum of every process's count"""
+        return self.pauses.value
+
+    @property
+    def running_processes(self):
+        return [p.pid for p in self.running]
+
+    @property
+    def paused_processes(self):
+        return [p.pid for p in self.paused]
+
+    def _best_ready(self):
+        """Best process among waiting and paused according to the policy, or None"""
+        if self.policy.waiting_first and self.waiting:
+            return self.waiting.peek()
+        candidates = [q.peek() for q in (self.waiting, self.paused) if q]
+        if not candidates:
+            return None
+        return min(candidates, key=self.policy.ready_key)
+
+    def _dispatch(self, process):
+        """Move a waiting or paused process to the running set"""
+        if process in self.waiting:
+            self.waiting.remove(process)
+            process.start()
+        else:
+            self.paused.remove(process)
+            process.resume()
+        now = self.engine.clock()
+        if self._freed:
+            self.refill_latency.observe(max(0.0, now - self._freed.popleft()))
+        if process.first_run_at is None:
+            process.first_run_at = now
+            self.response_time.observe(now - process.submitted_at)
+            self.starts.inc()
+        else:
+            self.resumes.inc()
+        process.slice_start = now
+        self.running.push(process)
+        self.set_status(process, "Running")
+        self.intervals.open(process.pid, self.engine.wall())
+        self._journal_status(process)
+
+    def _preempt(self, process):
+        self.running.remove(process)
+        process.pause()
+        process.context_switches += 1
+        self.pauses.inc()
+        now = self.engine.clock()
+        process.cpu_time += max(0.0, now - process.slice_start)
+        process.ready_since = now
+        self.paused.push(process)
+        self.set_status(process, "Paused")
+        self.intervals.close(process.pid, self.engine.wall())
+        self._journal_status(process)
+
+    def schedule(self):
+        """Fill free slots from the run queues, then let the policy preempt.
+
+        Each decision is a heap peek/pop/push, so a pass costs
+        O(k log n) for k state changes instead of rescanning every process.
+        Only the difference between the current and the target running set
+        is paused or resumed: a running process is preempted only when the
+        limit drops, its slice runs out or a ready process outranks it, so
+        processes that stay in the top set are never interrupted (see
+        ``context_switches``). Time-sliced policies need this called
+        periodically to rotate work.
+        """
+        start = time.perf_counter()
+        self._schedule_pass()
+        self.last_pass_seconds = time.perf_counter() - start
+        self.pass_latency.observe(self.last_pass_seconds)
+
+    def _schedule_pass(self):
+        policy = self.policy
+        now = self.engine.clock()
+
+        # Drop processes that finished on the engine thread but whose
+        # completion message hasn't been handled yet (at most max_running)
+        for p in [p for p in self.running if p.finished]:
+            self._free_slot(p)
+
+        if policy.maybe_rekey(now):
+            for run_queue in (self.waiting, self.paused, self.running):
+                run_queue.rekey()
+        elif policy.dynamic_running:
+            for p in list(self.running):
+                self.running.update(p)
+
+        # The limit may have been lowered: park the lowest ranked extras
+        while len(self.running) > self.max_running:
+            self._preempt(self.running.peek())
+
+        if policy.time_sliced:
+            self._expire_slices(now)
+
+        while len(self.running) < self.max_running:
+            process = self._best_ready()
+            if process is None:
+                break
+            first_start = process in self.waiting
+            self._dispatch(process)
+            if first_start:
+                self.log(f"🚀 Process {process.pid} ({process.name}) started")
+            elif not policy.time_sliced:  # Slice rotations would flood the log
+                self.log(f"▶️ Process {process.pid} ({process.name}) resumed")
+        if self._freed and (len(self.running) >= self.max_running or not (self.waiting or self.paused)):
+            self._freed.clear()     # Nothing to refill with, or the limit was lowered
+
+        if policy.preemptive:
+            while True:
+                candidate = self._best_ready()
+                victim = self.running.peek()
+                if candidate is None or victim is None or not policy.outranks(candidate, victim, now):
+                    break
+                self._preempt(victim)
+                self._dispatch(candidate)
+
+    def next_alarm_time(self):
+        """Engine time at which the next absolute-time alarm is due, or None"""
+        if not self.timers:
+            return None
+        wall = self.engine.wall()
+        due = self.timers.next_due(wall)
+        if due is None:
+            return None
+        return self.engine.clock() + max(0.0, due - wall)
+
+    def next_wakeup(self):
+        """Engine time of the next slice expiry or alarm, whichever is first, or None"""
+        times = [t for t in (self.next_slice_expiry(), self.next_alarm_time()) if t is not None]
+        return min(times) if times else None
+
+    def next_slice_expiry(self):
+        """Engine time at which the next running time slice runs out, or None"""
+        if not self.policy.time_sliced or not self.running:
+            return None
+        return min(p.slice_start + self.policy.quantum_for(p) for p in self.running)
+
+    def _expire_slices(self, now):
+        """Rotate running processes whose time slice is used up, if work is waiting"""
+        policy = self.policy
+        expired = sorted((p for p in self.running if now >= p.slice_start + policy.quantum_for(p)),
+                         key=lambda p: p.slice_start)
+        ready = len(self.waiting) + len(self.paused)
+        for i, p in enumerate(expired):
+            policy.on_expire(p)
+            if i < ready:
+                self._preempt(p)
+            else:
+                p.cpu_time += now - p.slice_start
+                p.slice_start = now
+                self.running.update(p)
+
+    def handle_event(self, msg):
+        """Apply one queue message; return True if a reschedule is needed"""
+        if msg[0] == "update":
+            p = self.find_process(msg[1])
+            if p is not None:
+                p.progress = msg[2]
+                self._changed.add(p.pid)
+                if self.journal is not None and p.persistent:
+                    self.journal.record("progress", p.pid, p.remaining, p.progress)
+
+        elif msg[0] == "completed":
+            # A backend may report an exit more than once; only the first counts
+            p = self.find_process(msg[1])
+            if p is not None and p.status not in FINISHED:
+                for run_queue in (self.waiting, self.paused):
+                    if p in run_queue:
+                        run_queue.remove(p)
+                if p in self.running:
+                    self._free_slot(p)
+                p.is_running = False
+                if p.failure is None:
+                    self.set_status(p, "Completed")
+                    self._account_completion(p)
+                else:
+                    self.set_status(p, "Failed")
+                    self.failures.inc()
+                if p.recurrence is not None:
+                    # fire_at round-trips through the due time, so step past float rounding
+                    self._rearm.append((p.recurrence, max(self.engine.wall(), p.fire_at + 1e-6)))
+                self._journal_status(p)
+                if p.failure is None:
+                    self.log(f"🎉 Process {p.pid} ({p.name}) completed successfully!")
+                    self.notify(f"✅ Process {p.pid} finished execution!")
+                else:
+                    self.log(f"💥 Process {p.pid} ({p.name}) failed: {p.failure}")
+                    self.notify(f"❌ Process {p.pid} failed ({p.failure})")
+                return True
+
+        elif msg[0] == "gantt_start":
+            if msg[1] not in self.gantt_data:
+                self.gantt_data[msg[1]] = [msg[2], None]
+
+        elif msg[0] == "gantt_end":
+            if msg[1] in self.gantt_data:
+                self.gantt_data[msg[1]][1] = msg[2]
+            self.intervals.close(msg[1], msg[2])
+
+        return False
+
+    def _free_slot(self, p):
+        """Drop a finished process from the running set and start timing the refill of its slot"""
+        self.running.remove(p)
+        self._freed.append(p.completed_at if p.completed_at is not None else self.engine.clock())
+
+    def _account_completion(self, p):
+        completed_at = p.completed_at if p.completed_at is not None else self.engine.clock()
+        if p.slice_start is not None:
+            p.cpu_time += max(0.0, completed_at - p.slice_start)
+        if p.submitted_at is None:
+            return
+        turnaround = completed_at - p.submitted_at
+        waiting = max(0.0, turnaround - p.cpu_time)
+        self.turnaround_time.observe(turnaround)
+        self.wait_time.observe(waiting)
+        self.policy.record_completion(turnaround, waiting)
+
+    def process_events(self, limit=None, budget=None):
+        """Drain queued messages; return True if a reschedule is needed.
+
+        Draining stops when the queue is empty, after ``limit`` messages or
+        after ``budget`` seconds; anything left is picked up by the next
+        call. Progress updates are coalesced so only the latest per pid is
+        applied, while completion and Gantt messages are always handled.
+        Absolute-time alarms that have come due are submitted first.
+        """
+        reschedule = self.release_due_alarms() > 0
+        processed = 0
+        latest = {}
+        lag = 0.0
+        deadline = None if budget is None else time.perf_counter() + budget
+        try:
+            while limit is None or processed < limit:
+                msg = self.queue.get_nowait()
+                if processed == 0:
+                    lag = time.monotonic() - self.queue.last_stamp
+                processed += 1
+                if msg[0] == "update":
+                    if msg[1] in latest:
+                        self.events_coalesced += 1
+                    latest[msg[1]] = msg
+                else:
+                    reschedule = self.handle_event(msg) or reschedule
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+        except thread_queue.Empty:
+            pass
+
+        for msg in latest.values():
+            self.handle_event(msg)
+        if self._rearm:
+            self.timers.rearm(self._rearm)  # One store write for every recurrence that completed
+            self._rearm = []
+        self.events_handled.inc(processed)
+        self.event_lag = lag
+        self.queue_depth = self.queue.qsize()
+        return reschedule
+
+    def is_idle(self):
+        return self.count("Completed") + self.count("Failed") == len(self.processes) and not self.timers
+
+
+class AdaptiveConcurrency:
+    """Grows or shrinks ``core.max_running`` from system load and throughput.
+
+    Call ``update()`` regularly; every ``interval`` seconds it compares the
+    1-minute load average per core with ``low_load``/``high_load`` and the
+    completions per second with the previous interval. It shrinks the limit
+    by one when the machine is overloaded or when the last growth step
+    didn't raise throughput, and grows it by one when there is spare
+    capacity and work waiting. Where ``os.getloadavg`` is unavailable only
+    the throughput signal is used.
+    """
+
+    def __init__(self, core, min_running=1, max_limit=None, interval=5.0,
+                 low_load=0.7, high_load=1.0):
+        self.core = core
+        self.min_running = min_running
+        self.max_limit = max_limit or 4 * (os.cpu_count() or 1)
+        self.interval = interval
+        self.low_load = low_load
+        self.high_load = high_load
+        self.throughput = None
+        self._grew = False
+        self._last_time = time.monotonic()
+        self._last_completed = core.total("Completed")
+
+    def load_per_core(self):
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            return None
+
+    def update(self, now=None):
+        """Adjust the limit if an interval has passed; return True if it changed"""
+        now = time.monotonic() if now is None else now
+        elapsed = now - self._last_time
+        if elapsed < self.interval:
+            return False
+
+        completed = self.core.total("Completed")
+        throughput = (completed - self._last_completed) / elapsed
+        previous, self.throughput = self.throughput, throughput
+        self._last_time, self._last_completed = now, completed
+
+        load = self.load_per_core()
+        current = self.core.max_running
+        target = current
+        if load is not None and load > self.high_load:
+            target -= 1
+        elif self._grew and previous is not None and throughput <= previous:
+            target -= 1  # Growing didn't help, back off
+        elif (load is None or load < self.low_load) and (self.core.waiting or self.core.paused):
+            target += 1
+
+        target = max(self.min_running, min(self.max_limit, target))
+        self._grew = target > current
+        if target == current:
+            return False
+        self.core.set_max_running(target)
+        return True
+
+
+class AdaptivePoll:
+    """Poll interval that backs off while nothing is changing.
+
+    Completions wake the front end through ``EventQueue.wakeup``, so polls
+    only pick up progress updates and time slices. ``next(active)`` returns
+    ``fastest`` after a poll that found work and doubles the interval, up
+    to ``slowest``, while polls come back empty. It never sleeps past the
+    next slice expiry or absolute-time alarm.
+    """
+
+    def __init__(self, core, fastest=0.1, slowest=2.0):
+        self.core = core
+        self.fastest = fastest
+        self.slowest = max(fastest, slowest)
+        self.interval = fastest
+
+    def next(self, active):
+        self.interval = self.fastest if active else min(self.slowest, self.interval * 2)
+        wakeup = self.core.next_wakeup()
+        if wakeup is None:
+            return self.interval
+        return max(0.0, min(self.interval, wakeup - self.core.engine.clock()))
+
+
+def parse_alarm(text):
+    """Parse a NAME:SECONDS[:PRIORITY] alarm specification"""
+    parts = text.split(":")
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"invalid alarm {text!r}, expected NAME:SECONDS[:PRIORITY]")
+    try:
+        seconds = float(parts[1])
+        priority = int(parts[2]) if len(parts) == 3 else 5
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid alarm {text!r}, time and priority must be numbers")
+    if not math.isfinite(seconds) or seconds < 0:
+        raise argparse.ArgumentTypeError(f"invalid alarm {text!r}, time must be a finite number of seconds >= 0")
+    return parts[0], seconds, priority
+
+
+def parse_at(text):
+    """Parse a NAME:SECONDS[:PRIORITY]@WHEN absolute-time alarm (see timers.parse_when)"""
+    spec, sep, when = text.rpartition("@")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"invalid alarm {text!r}, expected NAME:SECONDS[:PRIORITY]@WHEN")
+    name, seconds, priority = parse_alarm(spec)
+    try:
+        fire_at = parse_when(when)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time {when!r}, expected an ISO date and time, "
+                                         "HH:MM[:SS] or +SECONDS")
+    return name, seconds, priority, fire_at
+
+
+def parse_command(text):
+    """Parse a NAME:PRIORITY:COMMAND job specification"""
+    parts = text.split(":", 2)
+    if len(parts) != 3 or not parts[2].strip():
+        raise argparse.ArgumentTypeError(f"invalid command {text!r}, expected NAME:PRIORITY:COMMAND")
+    try:
+        priority = int(parts[1])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid command {text!r}, priority must be a number")
+    return parts[0], priority, parts[2]
+
+
+def parse_webhook(text):
+    if not is_local_url(text):
+        raise argparse.ArgumentTypeError(f"invalid webhook {text!r}, expected http://localhost[:PORT]/PATH")
+    return text
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Multiprocess alarm scheduler")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the scheduler without a display")
+    parser.add_argument("--alarm", action="append", type=parse_alarm, default=[],
+                        metavar="NAME:SECONDS[:PRIORITY]", help="alarm to schedule (repeatable)")
+    parser.add_argument("--at", action="append", type=parse_at, default=[],
+                        metavar="NAME:SECONDS[:PRIORITY]@WHEN",
+                        help="alarm that fires at WHEN: 2026-10-17T09:00, 09:00 or +SECONDS (repeatable)")
+    parser.add_argument("--repeat", action="append", nargs=2, default=[],
+                        metavar=("NAME:SECONDS[:PRIORITY]", "SCHEDULE"),
+                        help="recurring alarm; SCHEDULE is a cron expression such as '0 9 * * mon-fri' "
+                             "or '@every 5m' (repeatable)")
+    parser.add_argument("--alarm-store", metavar="FILE",
+                        help="keep alarms that are not yet due in this SQLite file, so they survive restarts "
+                             "(default: alarms.db in --journal, else a temporary file; ':memory:' keeps "
+                             "them in RAM)")
+    parser.add_argument("--alarm-window", type=float, default=300.0, metavar="SECONDS",
+                        help="page alarms due within this many seconds into memory (default: 300)")
+    parser.add_argument("--command", action="append", type=parse_command, default=[],
+                        metavar="NAME:PRIORITY:COMMAND",
+                        help="shell command to run as a real child process (repeatable)")
+    parser.add_argument("--import", dest="import_files", action="append", default=[],
+                        metavar="FILE", help="bulk load alarms from a CSV or JSONL file (repeatable)")
+    parser.add_argument("--max-running", type=int, default=None,
+                        help="concurrent processes (default: one per core)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="tune --max-running from load average and throughput")
+    parser.add_argument("--preemptive", action="store_true",
+                        help="let higher priority work displace running work (priority policy only)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="priority",
+                        help="scheduling policy (default: priority)")
+    parser.add_argument("--quantum", type=float, default=None, metavar="SECONDS",
+                        help="time slice for rr/mlfq, seconds per priority level for aging")
+    parser.add_argument("--journal", metavar="DIR",
+                        help="persist state to a write-ahead journal in DIR and restore it on start")
+    parser.add_argument("--log-file", metavar="FILE",
+                        help="write the full system log to FILE, rotated by size")
+    parser.add_argument("--log-max-bytes", type=int, default=10_000_000, metavar="N",
+                        help="rotate the log file after N bytes")
+    parser.add_argument("--log-backups", type=int, default=5, metavar="N",
+                        help="rotated log files to keep")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="write a JSON metrics snapshot to FILE periodically")
+    parser.add_argument("--metrics-interval", type=float, default=10.0, metavar="SECONDS",
+                        help="seconds between metrics snapshots (default: 10)")
+    parser.add_argument("--simulate", action="store_true",
+                        help="replay the alarms on a virtual clock and print throughput and turnaround")
+    parser.add_argument("--simulate-for", type=float, default=None, metavar="SECONDS",
+                        help="with --simulate, stop after this much virtual time "
+                             "(default: until all work is done, or one day with recurring alarms)")
+    parser.add_argument("--simulate-output", metavar="FILE",
+                        help="with --simulate, write completion order, Gantt data and statistics as JSON")
+    parser.add_argument("--poll", type=float, default=0.1,
+                        help="shortest seconds between event queue polls; completions wake the loop at once")
+    parser.add_argument("--max-poll", type=float, default=2.0,
+                        help="longest seconds between polls while nothing changes (default: 2)")
+    parser.add_argument("--notify-rate", type=int, default=3, metavar="N",
+                        help="notifications shown per second before they are batched into a digest")
+    parser.add_argument("--notify-log", metavar="FILE", help="also append notifications to FILE")
+    parser.add_argument("--notify-webhook", type=parse_webhook, metavar="URL",
+                        help="also POST notifications as JSON to a localhost URL")
+    parser.add_argument("--desktop-notify", action="store_true",
+                        help="also show native desktop notifications")
+    return parser
+
+
+def build_core(args, engine=None):
+    """Create a SchedulerCore from parsed command line arguments"""
+    backend = None
+    if args.command:
+        from backends import ProcessBackend
+        backend = ProcessBackend()
+
+    journal = None
+    if args.journal:
+        from journal import Journal
+        journal = Journal(args.journal)
+
+    log_file = None
+    if args.log_file:
+        from logfile import RotatingLog
+        log_file = RotatingLog(args.log_file, args.log_max_bytes, args.log_backups)
+
+    alarm_store = args.alarm_store
+    if alarm_store is None:
+        # A temporary file unless there is a journal to keep alarms beside
+        alarm_store = os.path.join(args.journal, "alarms.db") if args.journal else ""
+    timers = AlarmTimers(AlarmStore(alarm_store), window=args.alarm_window)
+    max_running = args.max_running
+    if max_running is None and backend is not None:
+        max_running = backend.workers   # One running job per worker
+    core = SchedulerCore(max_running=max_running, engine=engine, backend=backend, journal=journal,
+                         log_file=log_file, policy=make_policy(args.policy, args.quantum, args.preemptive),
+                         timers=timers)
+    if args.metrics_port is not None or args.metrics_file:
+        from metrics import MetricsServer, SnapshotWriter
+        if args.metrics_port is not None:
+            core.exporters.append(MetricsServer(core.metrics, args.metrics_port))
+        if args.metrics_file:
+            core.exporters.append(SnapshotWriter(core.metrics, args.metrics_file, args.metrics_interval))
+    return core
+
+
+def load_work(core, args):
+    """Restore journaled processes, then add imported and command line ones"""
+    if core.journal is not None:
+        core.restore(*core.journal.recover())
+    for path in args.import_files:
+        import_alarms(core, path)
+    for name, seconds, priority in args.alarm:
+        core.add_process(name, seconds, priority)
+    for name, seconds, priority, fire_at in args.at:
+        core.add_alarm_at(name, fire_at, seconds, priority)
+    for name, seconds, priority, schedule in args.repeat:
+        core.add_recurring(name, schedule, seconds, priority)
+    for name, priority, command in args.command:
+        core.add_job(name, command, priority)
+
+
+def run_headless(args):
+    """Run alarms to completion, printing log lines and notifications"""
+    core = build_core(args)
+    adaptive = AdaptiveConcurrency(core) if args.adaptive else None
+
+    def format_report(report):
+        return (f"📐 {report['policy']}: {report['completed']} completed, "
+                f"throughput {report['throughput']:.2f}/s, avg turnaround {report['avg_turnaround']:.2f}s, "
+                f"avg waiting {report['avg_waiting']:.2f}s")
+
+    def print_line(message):
+        ts = datetime.datetime.now().strftime("[%H:%M:%S]")
+        print(f"{ts} {message}", flush=True)
+
+    notifier = build_notifier(args, [CallbackSink(lambda message: print_line(f"🔔 {message}"))])
+
+    def print_listener(kind, message):
+        if kind == "notify":
+            notifier.post(message)
+        else:
+            print_line(message)
+
+    core.subscribe(print_listener)
+    wake = threading.Event()
+    core.queue.wakeup = wake.set
+    poll = AdaptivePoll(core, args.poll, args.max_poll)
+    load_work(core, args)
+    core.schedule()
+
+    try:
+        delay = poll.next(True)
+        while not core.is_idle():
+            wake.wait(delay)
+            wake.clear()
+            handled = core.events_handled.value
+            if core.process_events() or core.policy.time_sliced:
+                core.schedule()
+            if adaptive is not None:
+                adaptive.update()
+            notifier.flush()
+            delay = poll.next(core.events_handled.value != handled)
+        core.process_events()
+        print_line(format_report(core.policy_report()))
+        if core.failures.value:
+            print_line(f"💥 {core.failures.value} processes failed")
+        refills = core.refill_latency
+        if refills.count:
+            print_line(f"⚡ Completion to next start: {refills.mean() * 1e3:.2f} ms mean over {refills.count} refills")
+    except KeyboardInterrupt:
+        for p in core.processes:
+            p.stop()
+    finally:
+        notifier.close()
+        core.close()
+    return core
+
+
+def parse_args(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.preemptive and args.policy != "priority":
+        parser.error(f"--preemptive only applies to --policy priority; {args.policy} has a fixed preemption rule")
+    if args.simulate and (args.command or args.journal or args.alarm_store not in (None, ":memory:")):
+        parser.error("--simulate replays alarms only; it can't be combined with --command, --journal "
+                     "or --alarm-store")
+    if args.quantum is not None and args.quantum <= 0:
+        parser.error("--quantum must be positive")
+    repeats = []
+    for spec, schedule in args.repeat:
+        try:
+            name, seconds, priority = parse_alarm(spec)
+            compile_schedule(schedule)
+        except (argparse.ArgumentTypeError, ValueError) as e:
+            parser.error(f"--repeat: {e}")
+        repeats.append((name, seconds, priority, schedule))
+    args.repeat = repeats
+    if args.alarm_window <= 0:
+        parser.error("--alarm-window must be positive")
+    if args.poll <= 0:
+        parser.error("--poll must be positive")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.simulate:
+        from simulation import run_simulation
+        run_simulation(args)
+    else:
+        run_headless(args)
+
+
+if __name__ == "__main__":
+    main()
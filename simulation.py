@@ -0,0 +1,159 @@
+# # Multiprocess-Alarm-Schedule - virtual-clock discrete-event simulation
+
+import heapq
+import json
+import math
+import time
+
+
+class SimulatedEngine:
+    """Drop-in replacement for TickEngine that runs on a virtual clock.
+
+    Nothing waits in real time: ``advance(t)`` jumps the clock from one
+    pending wake-up to the next and calls ``process._tick`` exactly as the
+    driver thread would, so processes, SchedulerCore and the policies run
+    unchanged. By default processes only wake at their completion deadline
+    (``tick`` is infinite); pass a finite ``tick`` to also replay progress
+    updates. ``wall()`` maps virtual time onto ``epoch`` for Gantt and
+    start/end timestamps.
+    """
+
+    def __init__(self, tick=math.inf, epoch=None):
+        self.tick = tick
+        self.now = 0.0
+        self.epoch = time.time() if epoch is None else epoch
+        self._heap = []             # (wake time, seq, token, process)
+        self._seq = 0
+        self._armed = 0
+
+    def clock(self):
+        return self.now
+
+    def wall(self):
+        return self.epoch + self.now
+
+    def arm(self, process, when):
+        if not process._armed:
+            self._armed += 1
+        process._armed = True
+        process._token += 1
+        heapq.heappush(self._heap, (when, self._seq, process._token, process))
+        self._seq += 1
+
+    def post(self, queue, item):
+        queue.put(item)
+
+    def disarm(self, process):
+        if process._armed:
+            self._armed -= 1
+            process._armed = False
+            process._suspend(self.now)
+        process._token += 1
+        if len(self._heap) > 64 and len(self._heap) > 4 * self._armed:
+            self._heap = [e for e in self._heap if e[2] == e[3]._token]
+            heapq.heapify(self._heap)
+
+    def next_time(self):
+        """Virtual time of the next live wake-up, or None"""
+        heap = self._heap
+        while heap and heap[0][2] != heap[0][3]._token:
+            heapq.heappop(heap)     # Paused or stopped since armed
+        return heap[0][0] if heap else None
+
+    def advance(self, until):
+        """Fire every wake-up due by ``until``, then set the clock to ``until``"""
+        heap = self._heap
+        while heap and heap[0][0] <= until:
+            when, _, token, process = heapq.heappop(heap)
+            if token != process._token:
+                continue
+            self.now = max(self.now, when)
+            next_when = process._tick(when)
+            if next_when is None:
+                self._armed -= 1
+                process._armed = False
+            else:
+                heapq.heappush(heap, (next_when, self._seq, token, process))
+                self._seq += 1
+        self.now = max(self.now, until)
+
+
+def completion_order(core):
+    """Pids in the order they completed (ties broken by pid)"""
+    done = [core.find_process(pid) for pid in core.by_status["Completed"]]
+    return [p.pid for p in sorted(done, key=lambda p: (p.completed_at, p.pid))]
+
+
+class Simulation:
+    """Drives a SchedulerCore built on a SimulatedEngine as a discrete-event simulation.
+
+    Between events the core handles its queue and runs ``schedule()``
+    exactly like the GUI or headless loop, but with no polling delay, so
+    a run is the idealised version of a real one: same decisions, same
+    completion order, with event-handling latency removed.
+    """
+
+    def __init__(self, core):
+        if not isinstance(core.engine, SimulatedEngine):
+            raise TypeError("Simulation needs a SchedulerCore whose engine is a SimulatedEngine")
+        self.core = core
+        self.engine = core.engine
+        self.steps = 0
+        self.wall_seconds = 0.0
+
+    def run(self, until=math.inf):
+        """Run until every process completed or the virtual clock reaches ``until``"""
+        core, engine = self.core, self.engine
+        started = time.perf_counter()
+        while True:
+            core.process_events()
+            core.schedule()
+            candidates = [t for t in (engine.next_time(), core.next_wakeup()) if t is not None]
+            if not candidates:
+                break
+            next_time = min(candidates)
+            if next_time > until:
+                engine.advance(until)
+                break
+            engine.advance(next_time)
+            self.steps += 1
+        core.process_events()
+        self.wall_seconds += time.perf_counter() - started
+        return self.result()
+
+    def result(self):
+        core = self.core
+        return {
+            "virtual_seconds": self.engine.now,
+            "wall_seconds": self.wall_seconds,
+            "steps": self.steps,
+            "processes": len(core.processes),
+            "completed": core.total("Completed"),
+            "report": core.policy_report(),
+            "completion_order": completion_order(core),
+            "gantt_data": {pid: span for pid, span in core.gantt_data.items()},
+        }
+
+
+def run_simulation(args):
+    """Simulate the alarms given on the command line and print a summary"""
+    from scheduler_core import build_core, load_work
+
+    core = build_core(args, engine=SimulatedEngine())
+    load_work(core, args)
+    until = args.simulate_for
+    if until is None:
+        # Recurring alarms never run out of work
+        until = 86400.0 if core.timers is not None and core.timers.recurrences else math.inf
+    result = Simulation(core).run(until)
+    report = result["report"]
+    print(f"simulated {result['processes']} processes ({result['completed']} completed) "
+          f"under {report['policy']}, max_running={core.max_running}")
+    print(f"virtual time {result['virtual_seconds']:.1f}s replayed in {result['wall_seconds']:.2f}s "
+          f"({result['steps']} steps)")
+    print(f"throughput {report['throughput']:.3f}/s, avg turnaround {report['avg_turnaround']:.1f}s, "
+          f"avg waiting {report['avg_waiting']:.1f}s")
+    if args.simulate_output:
+        with open(args.simulate_output, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+    return result
@@ -0,0 +1,78 @@
+import time
+
+from backends import ProcessBackend
+from journal import Journal
+from scheduler_core import SchedulerCore
+
+
+def boom():
+    raise RuntimeError("boom")
+
+
+def run_until_idle(core, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    core.schedule()
+    while not core.is_idle():
+        assert time.monotonic() < deadline, "jobs did not finish"
+        if core.process_events():
+            core.schedule()
+        time.sleep(0.01)
+    core.process_events()
+
+
+def test_failed_jobs_are_not_completions():
+    core = SchedulerCore(max_running=3, backend=ProcessBackend())
+    ok = core.add_job("ok", "true", 1)
+    bad = core.add_job("bad", "false", 1)
+    raises = core.add_job("raises", boom, 1)
+    run_until_idle(core)
+
+    assert ok.status == "Completed" and ok.failure is None
+    assert bad.status == "Failed" and bad.failure == "exit code 1"
+    assert raises.status == "Failed" and raises.failure == "exit code 1"
+    assert core.failures.value == 2
+    assert core.policy.completed == 1
+    core.close()
+
+
+def test_jobs_are_not_restored_as_countdowns(tmp_path):
+    journal = Journal(str(tmp_path / "journal"))
+    core = SchedulerCore(max_running=2, backend=ProcessBackend(), journal=journal)
+    job = core.add_job("sleeper", "sleep 30", 1, expected_time=1)
+    alarm = core.add_process("tea", 60, 1)
+    core.schedule()
+    assert job.status == "Running"
+    job.stop()
+    core.close()
+
+    recovered = Journal(str(tmp_path / "journal"))
+    restored = SchedulerCore()
+    restored.restore(*recovered.recover())
+    recovered.close()
+    assert restored.find_process(job.pid) is None
+    assert restored.find_process(alarm.pid).name == "tea"
+
+
+def test_a_command_that_cannot_start_fails():
+    core = SchedulerCore(max_running=2, backend=ProcessBackend())
+    missing = core.add_job("missing", "no_such_command_anywhere", 1)
+    after = core.add_job("after", "true", 1)
+    run_until_idle(core)
+    assert missing.status == "Failed" and missing.failure.startswith("failed to start:")
+    assert after.status == "Completed"
+    core.close()
+
+
+def test_non_finite_progress_is_ignored():
+    core = SchedulerCore(max_running=1, backend=ProcessBackend())
+    job = core.add_job("odd", ["sh", "-c", "echo PROGRESS inf; echo PROGRESS nan; echo PROGRESS 40"], 1)
+    run_until_idle(core)
+    assert job.status == "Completed"
+    core.close()
+
+
+def test_command_jobs_default_to_one_per_worker():
+    from scheduler_core import build_core, parse_args
+    core = build_core(parse_args(["--headless", "--command", "x:1:true"]))
+    assert core.max_running == core.backend.workers
+    core.close()
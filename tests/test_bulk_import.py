@@ -0,0 +1,54 @@
+import pytest
+
+from bulk_import import import_alarms, parse_alarms
+from scheduler_core import SchedulerCore
+
+
+def parse(records):
+    stats = {"invalid": 0}
+    return list(parse_alarms(records, stats)), stats["invalid"]
+
+
+def test_valid_rows():
+    rows, invalid = parse([
+        {"name": "tea", "seconds": "180", "priority": "3"},
+        {"name": "nap", "sleep_time": 1.5},
+        {"name": "cron", "seconds": 1, "repeat": "@every 60s"},
+    ])
+    assert invalid == 0
+    assert rows == [("tea", 180.0, 3, None, None), ("nap", 1.5, 5, None, None),
+                    ("cron", 1.0, 5, None, "@every 60s")]
+
+
+@pytest.mark.parametrize("record", [
+    None,                                           # a .jsonl line that isn't JSON
+    {"seconds": 1},                                 # no name
+    {"name": "  ", "seconds": 1},
+    {"name": "x"},                                  # no duration
+    {"name": "x", "seconds": "soon"},
+    {"name": "x", "seconds": "nan"},
+    {"name": "x", "seconds": "inf"},
+    {"name": "x", "seconds": -1},
+    {"name": "x", "seconds": 1, "priority": "high"},
+    {"name": "x", "seconds": 1, "at": "tomorrow-ish"},
+    {"name": "x", "seconds": 1, "repeat": "every day"},
+])
+def test_invalid_rows_are_counted_and_skipped(record):
+    rows, invalid = parse([{"name": "ok", "seconds": 1}, record, {"name": "ok", "seconds": 2}])
+    assert invalid == 1
+    assert [row[1] for row in rows] == [1.0, 2.0]
+
+
+def test_import_counts_invalid_rows(tmp_path):
+    path = tmp_path / "alarms.jsonl"
+    path.write_text('{"name": "a", "seconds": 1}\n'
+                    'not json\n'
+                    '\n'
+                    '{"name": "b", "seconds": NaN}\n'
+                    '{"name": "c", "seconds": 2, "priority": 1}\n', encoding="utf-8")
+    core = SchedulerCore(max_running=1)
+    messages = []
+    core.listeners.append(lambda kind, message: messages.append(message))
+    assert import_alarms(core, str(path), chunk_size=2) == 2
+    assert [p.name for p in core.processes] == ["a", "c"]
+    assert "2 invalid rows skipped" in messages[-2]   # the log line, then the notification
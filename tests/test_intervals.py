@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from intervals import IntervalStore
+
+
+def brute_force(segments, t0, t1):
+    return sorted((pid, start, end) for pid, start, end in segments if end > t0 and start <= t1)
+
+
+def interleaved_run(store, seed, steps=2000):
+    """Open and close segments the way SchedulerCore does, returning every closed segment.
+
+    Preemptions close at the current time; completions close later, when
+    their event is drained, at the earlier completion time.
+    """
+    rng = random.Random(seed)
+    now = 0.0
+    running = {}
+    completed = []                  # (pid, completed_at) still to be drained
+    closed = []
+    next_pid = 1
+    for _ in range(steps):
+        now += rng.uniform(0.0, 0.02)
+        action = rng.random()
+        if action < 0.3 or not running:
+            store.open(next_pid, now)
+            running[next_pid] = now
+            next_pid += 1
+        elif action < 0.6:
+            pid = rng.choice(list(running))
+            store.close(pid, now)
+            closed.append((pid, running.pop(pid), now))
+        elif action < 0.8:
+            pid = rng.choice(list(running))
+            completed.append((pid, now))
+            store.open(next_pid, now)   # The slot is refilled before the event is drained
+            running[next_pid] = now
+            next_pid += 1
+        else:
+            for pid, completed_at in completed:
+                if pid in running:
+                    store.close(pid, completed_at)
+                    start = running.pop(pid)
+                    closed.append((pid, start, max(completed_at, start)))
+            completed.clear()
+    return closed, now
+
+
+@pytest.mark.parametrize("block", [IntervalStore.BLOCK, 16, 1])
+def test_query_matches_linear_scan_with_out_of_order_ends(block):
+    store = IntervalStore()
+    store.BLOCK = block
+    closed, end = interleaved_run(store, seed=1)
+    assert list(store._ends) != sorted(store._ends)
+    rng = random.Random(2)
+    for _ in range(500):
+        t0 = rng.uniform(0.0, end)
+        t1 = t0 + rng.uniform(0.0, end / 10)
+        assert sorted(store.query(t0, t1)) == brute_force(closed, t0, t1)
+
+
+@pytest.mark.parametrize("block", [IntervalStore.BLOCK, 16, 7])
+def test_query_after_trim(block):
+    store = IntervalStore(max_segments=200)
+    store.BLOCK = block
+    interleaved_run(store, seed=3)
+    kept = list(zip(store._pids, store._starts, store._ends))
+    rng = random.Random(4)
+    for _ in range(200):
+        t0 = rng.uniform(min(store._starts), max(store._ends))
+        t1 = t0 + rng.uniform(0.0, 1.0)
+        assert sorted(store.query(t0, t1)) == brute_force(kept, t0, t1)
+
+
+def test_long_segment_closed_late_is_found():
+    store = IntervalStore()
+    store.BLOCK = 4
+    store.open(0, 0.0)
+    for pid in range(1, 20):
+        store.open(pid, pid * 10.0)
+        store.close(pid, pid * 10.0 + 1)
+    store.close(0, 500.0)           # started before everything closed ahead of it
+    assert store.query(2.0, 3.0) == [(0, 0.0, 500.0)]
+    assert sorted(store.query(55.0, 59.0)) == [(0, 0.0, 500.0)]
+    assert sorted(store.query(50.0, 50.5)) == [(0, 0.0, 500.0), (5, 50.0, 51.0)]
@@ -0,0 +1,44 @@
+from journal import Journal
+
+
+def test_recovery_discards_a_torn_tail(tmp_path):
+    directory = str(tmp_path)
+    journal = Journal(directory)
+    journal.record("add", 1, "tea", 180, 3)
+    journal.record("add", 2, "backup", 600, 1)
+    journal.record("status", 1, "Running", 120.0, 33, "09:00:00", None)
+    journal.close()
+    with open(journal.wal_path, "ab") as f:
+        f.write(b'["status",2,"Runn')        # Crashed halfway through a write
+
+    journal = Journal(directory)
+    pid_counter, rows = journal.recover()
+    assert pid_counter == 3
+    assert rows == [[1, "tea", 180, 3, "Running", 120.0, 33, "09:00:00", None],
+                    [2, "backup", 600, 1, "Waiting", 600, 0, None, None]]
+    journal.record("status", 2, "Paused", 500.0, 16, "09:01:00", None)
+    journal.close()
+
+    # Records written after recovery must not land behind the torn line
+    journal = Journal(directory)
+    pid_counter, rows = journal.recover()
+    journal.close()
+    assert rows[1] == [2, "backup", 600, 1, "Paused", 500.0, 16, "09:01:00", None]
+
+
+def test_recovery_replays_wal_over_snapshot(tmp_path):
+    directory = str(tmp_path)
+    journal = Journal(directory, snapshot_every=2)
+    journal.record("add", 1, "tea", 180, 3)
+    journal.record("add", 2, "backup", 600, 1)
+    journal.close()
+    journal = Journal(directory, snapshot_every=100)
+    journal.record("remove", 1)
+    journal.record("priority", 2, 7)
+    journal.close()
+
+    journal = Journal(directory)
+    pid_counter, rows = journal.recover()
+    journal.close()
+    assert pid_counter == 3
+    assert rows == [[2, "backup", 600, 7, "Waiting", 600, 0, None, None]]
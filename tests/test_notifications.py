@@ -0,0 +1,51 @@
+from notifications import CallbackSink, Notifier, digest_category
+
+
+def notifier(rate=3, window=1.0):
+    messages = []
+    return Notifier([CallbackSink(messages.append)], rate=rate, window=window), messages
+
+
+def test_burst_beyond_the_rate_is_digested():
+    n, messages = notifier()
+    for pid in range(10):
+        n.post(f"✅ Process {pid} finished execution!", now=0.0)
+    assert len(messages) == 3
+    n.flush(now=0.5)                # window still open
+    assert len(messages) == 3
+    n.flush(now=1.0)
+    assert messages[3:] == ["7 processes completed"]
+    assert n.delivered == 4 and n.digested == 7
+
+
+def test_digest_counts_per_category():
+    n, messages = notifier(rate=1)
+    n.post("✅ Process 1 finished execution!", now=0.0)
+    n.post("✅ Process 2 finished execution!", now=0.1)
+    n.post("❌ Process 3 failed (exit code 1)", now=0.2)
+    n.post("❌ Process 4 failed (exit code 1)", now=0.3)
+    n.post("something else", now=0.4)
+    n.flush(now=1.0)
+    assert sorted(messages[1:]) == ["1 notifications", "1 processes completed", "2 processes failed"]
+
+
+def test_a_new_window_delivers_again():
+    n, messages = notifier(rate=2)
+    for t in (0.0, 0.1, 0.2):
+        n.post("tick", now=t)
+    n.post("tock", now=1.5)         # closes the first window, then opens a new one
+    assert messages == ["tick", "tick", "1 notifications", "tock"]
+
+
+def test_close_forces_the_digest():
+    n, messages = notifier(rate=1)
+    n.post("a", now=0.0)
+    n.post("b", now=0.0)
+    n.close()
+    assert messages == ["a", "1 notifications"]
+
+
+def test_digest_category():
+    assert digest_category("✅ Process 12 finished execution!") == "processes completed"
+    assert digest_category("❌ Process 12 failed (killed by SIGKILL)") == "processes failed"
+    assert digest_category("hello") == "notifications"
@@ -0,0 +1,39 @@
+import pytest
+
+from policies import make_policy
+from scheduler_core import SchedulerCore, parse_args
+from simulation import SimulatedEngine, Simulation
+
+
+def test_srtf_ranks_running_work_by_time_left():
+    engine = SimulatedEngine()
+    core = SchedulerCore(max_running=1, engine=engine, policy=make_policy("srtf"))
+    sim = Simulation(core)
+    a = core.add_process("a", 100, 1)
+    sim.run(until=90)
+    b = core.add_process("b", 20, 1)
+    sim.run(until=91)
+    assert a.status == "Running" and b.status == "Waiting"
+    assert a.context_switches == 0
+    sim.run()
+    assert a.completed_at == pytest.approx(100)
+    assert b.completed_at == pytest.approx(120)
+
+
+def test_srtf_preempts_for_shorter_work():
+    engine = SimulatedEngine()
+    core = SchedulerCore(max_running=1, engine=engine, policy=make_policy("srtf"))
+    sim = Simulation(core)
+    a = core.add_process("a", 100, 1)
+    sim.run(until=50)
+    b = core.add_process("b", 20, 1)
+    sim.run()
+    assert a.context_switches == 1
+    assert b.completed_at == pytest.approx(70)
+    assert a.completed_at == pytest.approx(120)
+
+
+def test_preemptive_flag_is_rejected_for_fixed_policies():
+    assert parse_args(["--headless", "--policy", "priority", "--preemptive"]).preemptive
+    with pytest.raises(SystemExit):
+        parse_args(["--headless", "--policy", "srtf", "--preemptive"])
@@ -0,0 +1,155 @@
+import datetime
+import random
+import sqlite3
+
+import pytest
+
+from recurrence import CronSchedule, compile_schedule
+from scheduler_core import SchedulerCore
+from simulation import SimulatedEngine, Simulation
+from timers import AlarmStore, AlarmTimers
+
+EPOCH = 1_800_000_000.0
+
+
+def simulated_core():
+    engine = SimulatedEngine(epoch=EPOCH)
+    return SchedulerCore(max_running=4, engine=engine, timers=AlarmTimers()), engine
+
+
+def test_cancelled_recurrence_id_is_not_reused():
+    core, engine = simulated_core()
+    sim = Simulation(core)
+    a = core.add_recurring("a", "@every 60s", 30, 1, start=EPOCH)
+    sim.run(until=10)               # a's first occurrence is running
+    assert core.cancel_recurring(a.id)
+    b = core.add_recurring("b", "@every 60s", 5, 1, start=EPOCH + 20)
+    assert b.id != a.id
+    sim.run(until=300)
+    names = [p.name for p in core.processes]
+    assert names.count("a") == 1
+    assert names.count("b") == 1    # only the latest occurrence keeps a row
+    assert b.runs == 5              # 20, 80, 140, 200, 260
+    rows = core.timers.store.db.execute("SELECT name FROM alarms").fetchall()
+    assert rows == [("b",)]
+
+
+def test_finished_occurrences_are_retired():
+    core, engine = simulated_core()
+    sim = Simulation(core)
+    for i in range(10):
+        core.add_recurring(f"r{i}", "@every 60s", 5, 1, start=EPOCH)
+    sim.run(until=86_390)
+    assert len(core.processes) == 10    # one row per recurrence, not one per run
+    assert core.total("Completed") == 10 * 1440
+    assert len(core.intervals) == 10 * 1440
+    assert len(core.gantt_data) == 10
+
+
+def test_alarm_ids_are_not_reused():
+    timers = AlarmTimers()
+    first = timers.add("x", EPOCH, 1, 1)
+    timers.pop_due(EPOCH)
+    assert timers.add("y", EPOCH, 1, 1) == first + 1
+
+
+def test_store_without_autoincrement_is_migrated(tmp_path):
+    path = str(tmp_path / "alarms.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE alarms (id INTEGER PRIMARY KEY, fire_at REAL NOT NULL, name TEXT NOT NULL, "
+               "seconds REAL NOT NULL, priority INTEGER NOT NULL)")
+    db.execute("INSERT INTO alarms VALUES (7, ?, 'old', 1, 1)", (EPOCH,))
+    db.commit()
+    db.close()
+    timers = AlarmTimers(AlarmStore(path))
+    assert len(timers) == 1
+    assert timers.add("new", EPOCH + 1, 1, 1) == 8
+    assert [row[2] for row in timers.pop_due(EPOCH + 1)] == ["old", "new"]
+    timers.close()
+
+
+def brute_force_next(expression, t):
+    """Scan matching days minute by minute for the first match strictly after t"""
+    schedule = CronSchedule(expression)
+    start = datetime.datetime.fromtimestamp(t).replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+    day = start.date()
+    for _ in range(366 * 8):
+        in_days = day.day in schedule.days
+        in_weekdays = day.isoweekday() % 7 in schedule.weekdays
+        if schedule.any_day or schedule.any_weekday:
+            day_ok = in_days and in_weekdays
+        else:
+            day_ok = in_days or in_weekdays
+        if day.month in schedule.months and day_ok:
+            for minute_of_day in range(24 * 60):
+                when = datetime.datetime.combine(day, datetime.time(minute_of_day // 60, minute_of_day % 60))
+                if when >= start and when.hour in schedule.hours and when.minute in schedule.minutes:
+                    return when.timestamp()
+        day += datetime.timedelta(days=1)
+    return None
+
+
+@pytest.mark.parametrize("expression", [
+    "*/5 * * * *", "0 9 * * mon-fri", "30 2 1 * *", "15 14 1,15 * 0", "0 0 29 2 *",
+    "0-10/3 8-18/2 * jan,jul sat", "@hourly", "@weekly", "59 23 31 12 *",
+])
+def test_cron_matches_brute_force(expression):
+    rng = random.Random(expression)
+    schedule = CronSchedule(expression)
+    for _ in range(20):
+        t = EPOCH + rng.uniform(0, 86400 * 400)
+        assert schedule.next_after(t) == brute_force_next(expression, t)
+
+
+def test_cron_fields():
+    schedule = CronSchedule("1-10/4,50 */6 * * 7")
+    assert schedule.minutes == [1, 5, 9, 50]
+    assert schedule.hours == [0, 6, 12, 18]
+    assert schedule.weekdays == {0}     # 7 is Sunday too
+
+
+def test_cron_day_fields_are_ored_when_both_restricted():
+    schedule = CronSchedule("0 0 13 * fri")
+    # 2027-01-13 is a Wednesday; the following Friday is the 15th
+    after = datetime.datetime(2027, 1, 12, 12).timestamp()
+    assert schedule.next_after(after) == datetime.datetime(2027, 1, 13).timestamp()
+    assert schedule.next_after(datetime.datetime(2027, 1, 13, 1).timestamp()) == \
+        datetime.datetime(2027, 1, 15).timestamp()
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *",
+                                        "*/0 * * * *", "* * * foo *", "@every", "@every 5x", "@every 0s"])
+def test_invalid_expressions_raise(expression):
+    with pytest.raises(ValueError):
+        compile_schedule(expression)
+
+
+def test_impossible_date_never_fires():
+    assert CronSchedule("0 0 30 2 *").next_after(EPOCH) is None
+
+
+def test_interval_keeps_to_its_grid():
+    schedule = compile_schedule("@every 1h30m")
+    assert schedule.seconds == 5400
+    assert schedule.next_after(EPOCH + 10, anchor=EPOCH + 100) == EPOCH + 100
+    assert schedule.next_after(EPOCH + 100, anchor=EPOCH + 100) == EPOCH + 5500
+    assert schedule.next_after(EPOCH + 12000, anchor=EPOCH + 100) == EPOCH + 16300
+
+
+def test_schedules_are_compiled_once():
+    assert compile_schedule("*/7 * * * *") is compile_schedule("*/7 * * * *")
+
+
+def test_countdowns_end_at_the_fire_time():
+    core, engine = simulated_core()
+    sim = Simulation(core)
+    core.add_alarm_at("once", EPOCH + 100, 30, 1)
+    r = core.add_recurring("every", "@every 60s", 0.1, 1, start=EPOCH + 10)
+    sim.run(until=3600)
+    once, = [p for p in core.processes if p.name == "once"]
+    assert once.fire_at == EPOCH + 100
+    assert once.completed_at == pytest.approx(100)
+    assert r.runs == 60                 # 10, 70, ..., 3550: no occurrence armed twice
+    every, = [p for p in core.processes if p.name == "every"]
+    assert every.fire_at == pytest.approx(EPOCH + 3550)
+    assert every.completed_at == pytest.approx(3550)
@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+from policies import POLICIES, make_policy
+from scheduler_core import RunQueue, SchedulerCore
+from simulation import SimulatedEngine, Simulation
+
+
+class Item:
+    def __init__(self, pid, priority):
+        self.pid = pid
+        self.priority = priority
+
+
+def drain(run_queue):
+    order = []
+    while len(run_queue):
+        order.append(run_queue.pop())
+    return order
+
+
+def assert_positions(run_queue):
+    assert {entry[1].pid: i for i, entry in enumerate(run_queue._heap)} == run_queue._pos
+
+
+def test_run_queue_update_remove_rekey():
+    rng = random.Random(1)
+    items = [Item(pid, rng.randint(1, 10)) for pid in range(1, 301)]
+    run_queue = RunQueue()
+    for item in items[:100]:
+        run_queue.push(item)
+    run_queue.extend(items[100:])
+    assert_positions(run_queue)
+
+    for item in rng.sample(items, 100):
+        item.priority = rng.randint(1, 10)
+        run_queue.update(item)
+    removed = rng.sample(items, 50)
+    for item in removed:
+        run_queue.remove(item)
+        assert item not in run_queue
+    assert_positions(run_queue)
+
+    kept = [item for item in items if item not in removed]
+    order = drain(run_queue)
+    assert order == sorted(kept, key=lambda item: (item.priority, item.pid))
+
+    for item in kept:
+        run_queue.push(item)
+    run_queue.rekey(lambda item: (-item.pid,))
+    assert_positions(run_queue)
+    assert [item.pid for item in drain(run_queue)] == sorted((item.pid for item in kept), reverse=True)
+
+
+def test_run_queue_worst_first():
+    run_queue = RunQueue(worst_first=True)
+    run_queue.extend([Item(1, 5), Item(2, 1), Item(3, 9)])
+    assert [item.pid for item in drain(run_queue)] == [3, 1, 2]
+
+
+@pytest.mark.parametrize("name", sorted(POLICIES))
+def test_simulated_run_stays_consistent(name):
+    rng = random.Random(name)
+    quantum = 5.0 if name in ("rr", "mlfq", "aging") else None
+    policy = make_policy(name, quantum, preemptive=name == "priority")
+    core = SchedulerCore(max_running=3, engine=SimulatedEngine(), policy=policy, check_consistency=True)
+    sim = Simulation(core)
+    core.add_processes([(f"p{i}", rng.randint(1, 60), rng.randint(1, 10)) for i in range(40)])
+    for step in range(1, 6):
+        sim.run(until=step * 20)
+        for p in rng.sample(list(core.processes), 5):
+            if p.status != "Completed":
+                core.change_priority(p.pid, rng.randint(1, 10))
+        core.add_processes([(f"late{step}-{i}", rng.randint(1, 30), rng.randint(1, 10)) for i in range(5)])
+    result = sim.run()
+    core.verify()
+    assert result["completed"] == len(core.processes) == 65
+    assert core.is_idle()
+    for p in core.processes:
+        assert p.cpu_time == pytest.approx(p.sleep_time, abs=1e-6)
+        ran = sum(end - start for start, end in core.intervals.segments(p.pid))
+        assert ran == pytest.approx(p.sleep_time, abs=1e-3)
+
+
+def test_progress_updates_are_coalesced():
+    core = SchedulerCore(max_running=2, engine=SimulatedEngine())
+    a, b = core.add_processes([("a", 10, 1), ("b", 10, 1)])
+    core.schedule()
+    core.process_events()                   # the Gantt start messages
+    core.take_changed()
+    handled = core.events_handled.value
+    for msg in [("update", a.pid, 10), ("update", a.pid, 20), ("update", b.pid, 5),
+                ("completed", b.pid), ("update", a.pid, 30), ("update", b.pid, 100)]:
+        core.queue.put(msg)
+    assert core.process_events()            # the completion asks for a reschedule
+    assert core.events_handled.value - handled == 6
+    assert core.events_coalesced == 3
+    assert (a.progress, b.progress) == (30, 100)
+    assert b.status == "Completed"
+    assert core.take_changed() == {a.pid, b.pid}
+
+
+def test_drain_limit_leaves_the_rest_queued():
+    core = SchedulerCore(max_running=1, engine=SimulatedEngine())
+    p, = core.add_processes([("p", 10, 1)])
+    for progress in range(5):
+        core.queue.put(("update", p.pid, progress))
+    assert not core.process_events(limit=2)
+    assert p.progress == 1 and core.queue_depth == 3
+    core.process_events()
+    assert p.progress == 4 and core.queue_depth == 0
+
+
+def test_preemption_only_touches_the_running_set_difference():
+    core = SchedulerCore(max_running=3, engine=SimulatedEngine(), preemptive=True, check_consistency=True)
+    procs = core.add_processes([(f"p{i}", 100, i) for i in range(1, 7)])
+    core.schedule()
+    assert sorted(core.running_processes) == [p.pid for p in procs[:3]]
+
+    core.change_priority(procs[5].pid, 0)       # outranks everything: displaces only the worst runner
+    core.schedule()
+    assert sorted(core.running_processes) == [procs[0].pid, procs[1].pid, procs[5].pid]
+    assert core.paused_processes == [procs[2].pid]
+    assert core.context_switches == 1
+
+    core.change_priority(procs[0].pid, 3)       # reordering inside the running set
+    core.change_priority(procs[3].pid, 5)       # and outside it
+    core.schedule()
+    assert core.context_switches == 1
+
+    core.change_priority(procs[2].pid, 1)       # the paused one comes back in place of p1
+    core.schedule()
+    assert procs[2].status == "Running" and procs[0].status == "Paused"
+    assert core.context_switches == 2
+    assert [p.context_switches for p in procs] == [1, 0, 1, 0, 0, 0]
@@ -0,0 +1,54 @@
+import argparse
+import math
+import threading
+import time
+
+import pytest
+
+from scheduler_core import EventQueue, ManagedProcess, SchedulerCore, TickEngine, parse_alarm
+
+
+def test_wakeup_runs_without_the_engine_lock():
+    # A front end that marshals the wake-up to another thread and waits for
+    # it (Tk's cross-thread calls do) must not deadlock with arm/disarm there
+    engine = TickEngine(tick=0.05)
+    queue = EventQueue()
+    other = ManagedProcess(2, "other", 10, 1, queue, engine)
+    woke = threading.Event()
+
+    def wakeup():
+        worker = threading.Thread(target=lambda: engine.disarm(other))
+        worker.start()
+        worker.join(timeout=2)
+        if not worker.is_alive():
+            woke.set()
+
+    queue.wakeup = wakeup
+    other.start()
+    ManagedProcess(1, "short", 0.1, 1, queue, engine).start()
+    assert woke.wait(timeout=3)
+
+
+def test_a_failing_countdown_does_not_stop_the_engine():
+    engine = TickEngine(tick=0.05)
+    core = SchedulerCore(max_running=2, engine=engine)
+    broken = core.add_process("broken", math.nan, 1)     # int(nan) raises in _tick
+    fine = core.add_process("fine", 0.2, 1)
+    core.schedule()
+    deadline = time.monotonic() + 3
+    while not core.is_idle():
+        assert time.monotonic() < deadline, "the engine thread died"
+        core.process_events()
+        time.sleep(0.01)
+    assert fine.status == "Completed"
+    assert broken.status == "Failed" and "ValueError" in broken.failure
+
+
+@pytest.mark.parametrize("text", ["a:nan", "a:inf", "a:-1", "a:-inf:2"])
+def test_parse_alarm_rejects_bad_durations(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_alarm(text)
+
+
+def test_parse_alarm_accepts_fractions():
+    assert parse_alarm("tea:0.25:3") == ("tea", 0.25, 3)
@@ -0,0 +1,85 @@
+import random
+
+from timers import AlarmTimers
+
+NOW = 1_800_000_000.0
+
+
+def drain(timers, until, step):
+    fired = []
+    t = NOW
+    while t <= until:
+        fired += timers.pop_due(t)
+        t += step
+    return fired
+
+
+def test_alarms_are_due_their_duration_before_they_fire():
+    timers = AlarmTimers()
+    timers.add("tea", NOW + 180, 30, 1)
+    assert timers.next_due(NOW) == NOW + 150
+    assert timers.pop_due(NOW + 149) == []
+    assert [row[:4] for row in timers.pop_due(NOW + 150)] == [(NOW + 150, 1, "tea", 30)]
+
+
+def test_only_alarms_in_the_window_are_paged_in():
+    timers = AlarmTimers(window=60)
+    timers.add_many([(NOW + 10, "soon", 0, 1), (NOW + 1000, "later", 0, 1)])
+    assert timers.next_due(NOW) == NOW + 10
+    assert timers.paged_in == 1 and len(timers) == 2
+    assert [row[2] for row in timers.pop_due(NOW + 10)] == ["soon"]
+    assert timers.next_due(NOW + 10) == NOW + 1000    # read from the store
+    assert timers.paged_in == 0
+    assert [row[2] for row in timers.pop_due(NOW + 1000)] == ["later"]
+    assert len(timers) == 0 and timers.next_due(NOW + 1000) is None
+
+
+def test_page_size_bounds_the_heap_and_each_pop():
+    timers = AlarmTimers(window=1e9, page_size=10)
+    timers.add_many([(NOW + i, f"a{i}", 0, 1) for i in range(35)])
+    timers.next_due(NOW)
+    assert timers.paged_in == 10
+    batches = []
+    while len(timers):
+        batch = timers.pop_due(NOW + 100)
+        assert 0 < len(batch) <= 10
+        batches.append(batch)
+    assert [row[2] for batch in batches for row in batch] == [f"a{i}" for i in range(35)]
+
+
+def test_alarms_added_around_the_watermark():
+    timers = AlarmTimers(window=1e9, page_size=4)
+    timers.add_many([(NOW + i, f"a{i}", 0, 1) for i in range(10)])
+    timers.next_due(NOW)
+    loaded = timers._loaded
+    assert loaded[0] == NOW + 3 and timers.paged_in == 4
+
+    timers.add("before", NOW + 2.5, 0, 1)   # behind the watermark: straight into the heap
+    assert timers.paged_in == 5
+    timers.add("after", NOW + 7.5, 0, 1)    # beyond it: stays in the store
+    assert timers.paged_in == 5 and timers._loaded == loaded
+    assert timers.next_due(NOW) == NOW
+
+    names = [row[2] for row in drain(timers, NOW + 10, 0.5)]
+    assert names == ["a0", "a1", "a2", "before", "a3", "a4", "a5", "a6", "a7", "after", "a8", "a9"]
+
+
+def test_random_adds_and_pops_fire_in_order():
+    rng = random.Random(7)
+    timers = AlarmTimers(window=50, page_size=16)
+    expected = []
+    t = NOW
+    fired = []
+    for step in range(200):
+        alarms = [(t + rng.uniform(0, 200), f"{step}-{i}", 0, 1) for i in range(rng.randint(0, 5))]
+        timers.add_many(alarms)
+        expected += alarms
+        t += rng.uniform(0, 3)
+        batch = timers.pop_due(t)
+        assert all(row[0] <= t for row in batch)
+        assert timers.next_due(t) is None or timers.next_due(t) > t or len(batch) == 16
+        fired += batch
+    fired += drain(timers, t + 300, 1.0)
+    assert len(timers) == 0
+    assert sorted(row[2] for row in fired) == sorted(alarm[1] for alarm in expected)
+    assert [row[0] for row in fired] == sorted(row[0] for row in fired)
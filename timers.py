@@ -0,0 +1,305 @@
+# # Multiprocess-Alarm-Schedule - absolute-time alarms in a paged timer heap
+
+import datetime
+import heapq
+import sqlite3
+import sys
+
+from recurrence import Recurrence, compile_schedule
+
+_END = sys.maxsize              # id bound meaning "every alarm at this fire time"
+
+# AUTOINCREMENT so a deleted id is never handed out again: a heap row or a
+# running occurrence may still refer to it
+_TABLES = {
+    "alarms": "id INTEGER PRIMARY KEY AUTOINCREMENT, fire_at REAL NOT NULL, name TEXT NOT NULL, "
+              "seconds REAL NOT NULL, priority INTEGER NOT NULL, recurrence INTEGER",
+    "recurrences": "id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, seconds REAL NOT NULL, "
+                   "priority INTEGER NOT NULL, schedule TEXT NOT NULL, anchor REAL, "
+                   "runs INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def parse_when(text, now=None):
+    """Parse a fire time into a Unix timestamp.
+
+    Accepts an ISO date and time (``2026-10-17T09:00``, local time unless an
+    offset is given), a clock time ``HH:MM[:SS]`` (the next such time from
+    ``now``), ``+SECONDS`` from now, or a bare Unix timestamp.
+    """
+    text = str(text).strip()
+    now = datetime.datetime.now() if now is None else now
+    if text.startswith("+"):
+        return now.timestamp() + float(text[1:])
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    try:
+        clock = datetime.time.fromisoformat(text)
+    except ValueError:
+        return datetime.datetime.fromisoformat(text).timestamp()
+    when = datetime.datetime.combine(now.date(), clock)
+    if when <= now:
+        when += datetime.timedelta(days=1)
+    return when.timestamp()
+
+
+class AlarmStore:
+    """Alarms waiting to be submitted, kept sorted on disk by SQLite.
+
+    Rows are ``(id, fire_at, name, seconds, priority, recurrence)`` with an
+    index on ``(fire_at, id)``, so reading the next page in order is a
+    range scan however many alarms are stored. The ``fire_at`` column holds
+    the time the alarm is due to be submitted (see ``AlarmTimers``). ``recurrence`` is the id of
+    the row in the ``recurrences`` table the alarm is an occurrence of, or
+    NULL for a one-shot alarm. The default ``path=""`` is a private
+    temporary file that SQLite deletes on close: pages spill to disk once
+    its small cache is full, so millions of future alarms don't stay in
+    RAM, but nothing survives a restart. ``":memory:"`` keeps the whole
+    store in RAM and has to be asked for.
+    """
+
+    def __init__(self, path=""):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        for table, columns in _TABLES.items():
+            self._create_table(table, columns)
+        self.db.execute("CREATE INDEX IF NOT EXISTS alarms_by_fire_at ON alarms (fire_at, id)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS alarms_by_recurrence ON alarms (recurrence)")
+        self.db.commit()
+
+    def _create_table(self, table, columns):
+        row = self.db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                              (table,)).fetchone()
+        if row is None:
+            self.db.execute(f"CREATE TABLE {table} ({columns})")
+        elif "AUTOINCREMENT" not in row[0].upper():
+            # Written by an older version: copy into a table that never reuses
+            # ids, picking up any column added since (e.g. alarms.recurrence)
+            old = ", ".join(info[1] for info in self.db.execute(f"PRAGMA table_info({table})"))
+            self.db.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+            self.db.execute(f"CREATE TABLE {table} ({columns})")
+            self.db.execute(f"INSERT INTO {table} ({old}) SELECT {old} FROM {table}_old")
+            self.db.execute(f"DROP TABLE {table}_old")
+
+    def _last_id(self, table):
+        row = self.db.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+        return row[0] if row else 0
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM alarms").fetchone()[0]
+
+    def max_id(self):
+        """Largest alarm id ever handed out, including deleted ones"""
+        return self._last_id("alarms")
+
+    def add_many(self, alarms):
+        """Insert (fire_at, name, seconds, priority, recurrence) rows; return the first new id"""
+        first = self.max_id() + 1
+        with self.db:
+            self.db.executemany("INSERT INTO alarms (fire_at, name, seconds, priority, recurrence) "
+                                "VALUES (?, ?, ?, ?, ?)", alarms)
+        return first
+
+    def page(self, after, until, limit):
+        """Alarms with ``(fire_at, id) > after`` and ``fire_at <= until``, in fire order"""
+        return self.db.execute("SELECT fire_at, id, name, seconds, priority, recurrence FROM alarms "
+                               "WHERE (fire_at, id) > (?, ?) AND fire_at <= ? ORDER BY fire_at, id LIMIT ?",
+                               (*after, until, limit)).fetchall()
+
+    def added_since(self, first_id, upto):
+        """Alarms with ``id >= first_id`` and ``(fire_at, id) <= upto``"""
+        return self.db.execute("SELECT fire_at, id, name, seconds, priority, recurrence FROM alarms "
+                               "WHERE id >= ? AND (fire_at, id) <= (?, ?)", (first_id, *upto)).fetchall()
+
+    def first_after(self, after):
+        row = self.db.execute("SELECT fire_at FROM alarms WHERE (fire_at, id) > (?, ?) "
+                              "ORDER BY fire_at, id LIMIT 1", after).fetchone()
+        return row[0] if row else None
+
+    def delete(self, ids):
+        with self.db:
+            self.db.executemany("DELETE FROM alarms WHERE id = ?", ((i,) for i in ids))
+
+    def add_recurrences(self, recurrences):
+        """Insert (name, seconds, priority, schedule, anchor) rows; return the first new id"""
+        first = self._last_id("recurrences") + 1
+        with self.db:
+            self.db.executemany("INSERT INTO recurrences (name, seconds, priority, schedule, anchor) "
+                                "VALUES (?, ?, ?, ?, ?)", recurrences)
+        return first
+
+    def load_recurrences(self):
+        return self.db.execute("SELECT id, name, seconds, priority, schedule, anchor, runs "
+                               "FROM recurrences").fetchall()
+
+    def unarmed_recurrences(self):
+        """Ids of recurrences with no pending alarm (their occurrence was running at shutdown)"""
+        return [row[0] for row in self.db.execute(
+            "SELECT id FROM recurrences WHERE id NOT IN "
+            "(SELECT recurrence FROM alarms WHERE recurrence IS NOT NULL)")]
+
+    def update_runs(self, recurrences):
+        with self.db:
+            self.db.executemany("UPDATE recurrences SET runs = ? WHERE id = ?",
+                                ((r.runs, r.id) for r in recurrences))
+
+    def delete_recurrence(self, recurrence_id):
+        """Drop a recurrence and its pending alarms; return how many alarms were pending"""
+        with self.db:
+            pending = self.db.execute("DELETE FROM alarms WHERE recurrence = ?", (recurrence_id,)).rowcount
+            self.db.execute("DELETE FROM recurrences WHERE id = ?", (recurrence_id,))
+        return pending
+
+    def close(self):
+        self.db.close()
+
+
+class AlarmTimers:
+    """Absolute-time alarms: a min-heap of the imminent ones over an AlarmStore.
+
+    An alarm fires, i.e. its countdown ends, at ``fire_at``, so it is due to
+    be submitted ``seconds`` earlier and is stored under that due time.
+    Waiting for a free slot can still make it fire late. Every alarm is
+    written to the store; only those due within ``window`` seconds, and at
+    most ``page_size`` of them, are paged into the heap keyed by
+    ``(due, id)``. ``_loaded`` is the key up to which every stored alarm is
+    in the heap, so an alarm added beyond it stays on disk until the window
+    reaches it. Submitted alarms are deleted from the store;
+    until then a file-backed store survives restarts.
+
+    Recurring alarms keep their definition (a ``Recurrence``) in
+    ``recurrences`` and exactly one pending occurrence in the store. The
+    next occurrence is computed once, by ``rearm()`` after the previous one
+    completed, and from then on it is an ordinary row in the heap, so a
+    poll costs the same however many recurrences are registered.
+    """
+
+    def __init__(self, store=None, window=300.0, page_size=10_000):
+        self.store = store if store is not None else AlarmStore()
+        self.window = window
+        self.page_size = page_size
+        self._heap = []             # (due, id, name, seconds, priority, recurrence id)
+        self._loaded = (float("-inf"), _END)
+        self._pending = self.store.count()
+        self.recurrences = {row[0]: Recurrence(*row) for row in self.store.load_recurrences()}
+
+    def __len__(self):
+        """Alarms registered and not yet fired"""
+        return self._pending
+
+    @property
+    def paged_in(self):
+        return len(self._heap)
+
+    def add(self, name, fire_at, seconds, priority, recurrence=None):
+        return self.add_many([(fire_at, name, seconds, priority, recurrence)])
+
+    def add_many(self, alarms):
+        """Register (fire_at, name, seconds, priority[, recurrence id]) alarms; return the first new id"""
+        alarms = [(fire_at - seconds, name, seconds, priority, rest[0] if rest else None)
+                  for fire_at, name, seconds, priority, *rest in alarms]
+        if not alarms:
+            return None
+        first = self.store.add_many(alarms)
+        self._pending += len(alarms)
+        if min(alarm[0] for alarm in alarms) <= self._loaded[0]:
+            for row in self.store.added_since(first, self._loaded):
+                heapq.heappush(self._heap, row)
+        return first
+
+    def _page_in(self, now):
+        # The heap top is the earliest alarm as long as the heap isn't empty,
+        # so refill only once it runs half empty rather than after every pop
+        horizon = now + self.window
+        while len(self._heap) <= self.page_size // 2 and self._loaded[0] < horizon:
+            limit = self.page_size - len(self._heap)
+            rows = self.store.page(self._loaded, horizon, limit)
+            for row in rows:
+                heapq.heappush(self._heap, row)
+            if len(rows) < limit:
+                self._loaded = (horizon, _END)
+            else:
+                self._loaded = rows[-1][:2]
+
+    def next_due(self, now):
+        """Due time of the earliest pending alarm, or None"""
+        self._page_in(now)
+        if self._heap:
+            return self._heap[0][0]
+        return self.store.first_after(self._loaded) if self._pending else None
+
+    def pop_due(self, now):
+        """Remove and return the (due, id, name, seconds, priority, recurrence id) rows due by ``now``.
+
+        At most ``page_size`` rows are returned per call, so a backlog of
+        overdue alarms after a restart is released over several calls.
+        """
+        due = []
+        while len(due) < self.page_size:
+            self._page_in(now)
+            if not self._heap or self._heap[0][0] > now:
+                break
+            row = heapq.heappop(self._heap)
+            if row[5] is None or row[5] in self.recurrences:
+                due.append(row)     # else its recurrence was cancelled and the row already deleted
+        if due:
+            self.store.delete(row[1] for row in due)
+            self._pending -= len(due)
+            fired = [self.recurrences[row[5]] for row in due if row[5] is not None]
+            for recurrence in fired:
+                recurrence.runs += 1
+            if fired:
+                self.store.update_runs(fired)
+        return due
+
+    def add_recurring(self, definitions, now):
+        """Register (name, seconds, priority, schedule, first_fire) recurrences; return them.
+
+        A ``first_fire`` of None means the schedule's first time after
+        ``now``. Every schedule is checked before anything is stored; an
+        invalid one, or one that never fires, raises ValueError.
+        """
+        rows = []
+        for name, seconds, priority, expression, first_fire in definitions:
+            if first_fire is None:
+                first_fire = compile_schedule(expression).next_after(now)
+                if first_fire is None:
+                    raise ValueError(f"schedule {expression!r} never fires")
+            rows.append((name, seconds, priority, expression, first_fire))
+        if not rows:
+            return []
+        first_id = self.store.add_recurrences(rows)
+        recurrences = [Recurrence(first_id + i, *row) for i, row in enumerate(rows)]
+        self.recurrences.update((r.id, r) for r in recurrences)
+        self.add_many((r.anchor, r.name, r.seconds, r.priority, r.id) for r in recurrences)
+        return recurrences
+
+    def rearm(self, pairs):
+        """Schedule the occurrence after ``after`` of each (recurrence, after) pair; return the new rows"""
+        alarms = []
+        for recurrence, after in pairs:
+            if self.recurrences.get(recurrence.id) is not recurrence:
+                continue            # Cancelled while its occurrence was running
+            fire_at = recurrence.next_after(after)
+            if fire_at is not None:
+                alarms.append((fire_at, recurrence.name, recurrence.seconds, recurrence.priority, recurrence.id))
+        self.add_many(alarms)
+        return alarms
+
+    def rearm_unarmed(self, now):
+        """Re-arm recurrences left without a pending occurrence by a restart"""
+        return self.rearm((self.recurrences[i], now) for i in self.store.unarmed_recurrences()
+                          if i in self.recurrences)
+
+    def cancel_recurring(self, recurrence_id):
+        """Stop a recurrence; return False if it is unknown"""
+        if self.recurrences.pop(recurrence_id, None) is None:
+            return False
+        self._pending -= self.store.delete_recurrence(recurrence_id)
+        return True
+
+    def close(self):
+        self.store.close()